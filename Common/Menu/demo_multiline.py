@@ -2,11 +2,7 @@
 Quick demo of the comma-separated multi-line column feature.
 """
 
-import sys
-import os
-
-# Add parent directory to path to import Common modules
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Run from the repository root, e.g. python -m Common.Menu.demo_multiline
 from Common.Menu import TerminalMenu
 
 
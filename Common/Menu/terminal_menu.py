@@ -13,7 +13,131 @@ Features:
 """
 
 import os
-from typing import List, Optional
+import re
+import sys
+import shutil
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+
+# ANSI "erase display" + "cursor home"
+_ANSI_CLEAR = "\x1b[2J\x1b[H"
+
+# Win32 console constants
+_STD_OUTPUT_HANDLE = -11
+_ENABLE_VIRTUAL_TERMINAL_PROCESSING = 0x0004
+
+
+def _enable_ansi() -> bool:
+    """
+    Make sure the attached console understands ANSI escape sequences.
+    
+    POSIX terminals always do. On Windows 10+ virtual terminal processing
+    has to be switched on for the console handle; older consoles refuse.
+    
+    Returns:
+        True if ANSI sequences can be written to stdout
+    """
+    if os.name != 'nt':
+        return True
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(_STD_OUTPUT_HANDLE)
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        if mode.value & _ENABLE_VIRTUAL_TERMINAL_PROCESSING:
+            return True
+        return bool(kernel32.SetConsoleMode(handle, mode.value | _ENABLE_VIRTUAL_TERMINAL_PROCESSING))
+    except (AttributeError, OSError):
+        return False
+
+
+def _win32_clear() -> None:
+    """Clear a legacy Windows console through the Win32 console API."""
+    import ctypes
+    from ctypes import wintypes
+    
+    class _CONSOLE_SCREEN_BUFFER_INFO(ctypes.Structure):
+        _fields_ = [
+            ("dwSize", wintypes._COORD),
+            ("dwCursorPosition", wintypes._COORD),
+            ("wAttributes", wintypes.WORD),
+            ("srWindow", wintypes.SMALL_RECT),
+            ("dwMaximumWindowSize", wintypes._COORD),
+        ]
+    
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.GetStdHandle(_STD_OUTPUT_HANDLE)
+    info = _CONSOLE_SCREEN_BUFFER_INFO()
+    if not kernel32.GetConsoleScreenBufferInfo(handle, ctypes.byref(info)):
+        return
+    
+    cells = info.dwSize.X * info.dwSize.Y
+    origin = wintypes._COORD(0, 0)
+    written = wintypes.DWORD()
+    kernel32.FillConsoleOutputCharacterW(handle, ctypes.c_wchar(' '), cells, origin, ctypes.byref(written))
+    kernel32.FillConsoleOutputAttribute(handle, info.wAttributes, cells, origin, ctypes.byref(written))
+    kernel32.SetConsoleCursorPosition(handle, origin)
+
+
+# Resolved once per process - enabling VT mode is a console-wide setting
+_ANSI_SUPPORTED = _enable_ansi()
+
+# Column cell format prefixes and the alignment each one uses
+_CELL_ALIGN = {"CENTER": "^", "LEFT": "<", "RIGHT": ">", "OPTION": "<"}
+
+# "text|indent" body of a LEFT: line - indent only counts when purely numeric
+_LEFT_SPEC_RE = re.compile(r"([^|]*)(?:\|(\d+)\Z)?", re.DOTALL)
+
+# "key|description|indent" body of an OPTION: line
+_OPTION_SPEC_RE = re.compile(r"([^|]*)(?:\|([^|]*)(?:\|(\d+)\Z)?)?", re.DOTALL)
+
+
+# Number of rendered windows / flattened structures remembered per menu
+_RENDER_CACHE_SIZE = 64
+
+
+def _freeze(structure):
+    """
+    Turn a (possibly nested) list structure into hashable tuples.
+    
+    Arguments:
+        structure: Menu content structure or one of its elements
+        
+    Returns:
+        The same structure with every list replaced by a tuple
+    """
+    if isinstance(structure, (list, tuple)):
+        return tuple(_freeze(element) for element in structure)
+    return structure
+
+
+def _cache_put(cache: dict, key, value) -> None:
+    """Store *value* in a bounded render cache, evicting the oldest entry."""
+    if len(cache) >= _RENDER_CACHE_SIZE:
+        del cache[next(iter(cache))]
+    cache[key] = value
+
+
+@lru_cache(maxsize=256)
+def _parse_multiline(col_text: str) -> Tuple[str, ...]:
+    """
+    Split a column string into its comma-separated lines.
+    
+    Cached because the same cell strings (e.g. "CENTER:✓") repeat across
+    rows and redraws.
+    
+    Arguments:
+        col_text: Column text, optionally containing commas
+        
+    Returns:
+        The stripped lines, or the unchanged text if it has no commas
+    """
+    if "," not in col_text:
+        return (col_text,)
+    return tuple(line.strip() for line in col_text.split(","))
 
 
 class TerminalMenu:
@@ -21,6 +145,9 @@ class TerminalMenu:
     A class for creating styled terminal menus with ASCII borders.
     """
     
+    # Repeated fill strings shared by every menu, keyed on (character, count)
+    _repeat_cache: Dict[Tuple[str, int], str] = {}
+    
     def __init__(self, width: int = 60) -> None:
         """
         Initialize the TerminalMenu with specified width.
@@ -30,11 +157,82 @@ class TerminalMenu:
         """
         self.width = max(width, 20)  # Ensure minimum width
         self.content_width = self.width - 2  # Account for left and right borders
+        # Output fragments ("║", content, "║\n" per row) joined verbatim by
+        # create_window, which also brackets them with the top/bottom borders
         self.lines: List[str] = []
+        self._clear_seq = _ANSI_CLEAR if _ANSI_SUPPORTED else ""
+        # Rows of the last window painted at the top of a cleared screen;
+        # empty when the window's screen position is unknown
+        self._prev_lines: List[str] = []
+        self._recompute_cache()
+        
+        # Rendered output of unchanged redraws, keyed on width + content
+        self._window_cache: dict = {}
+        self._content_cache: dict = {}
+        
+        # create_window line dispatch: whole-line keywords, then "PREFIX:" lines
+        # keyed on the text before the first colon
+        self._keyword_handlers = {
+            "VERTICAL_START": None,  # Mark for vertical section (visual only)
+            "VERTICAL_END": None,    # End of vertical section
+            "VERTICAL_SEP": self.add_empty_line,  # Small visual separator
+        }
+        self._prefix_handlers = {
+            "COLUMNS": self._add_columns_line,
+            "CENTER": self.add_centered_line,
+            "LEFT": self._add_left_spec,
+            "OPTION": self._add_option_spec,
+        }
+    
+    @classmethod
+    def _rep(cls, char: str, count: int) -> str:
+        """
+        Return char repeated count times, shared across all menus.
+        
+        Arguments:
+            char: The character to repeat
+            count: Number of repetitions
+            
+        Returns:
+            The repeated string
+        """
+        key = (char, count)
+        repeated = cls._repeat_cache.get(key)
+        if repeated is None:
+            repeated = char * count
+            cls._repeat_cache[key] = repeated
+        return repeated
+    
+    @property
+    def _is_tty(self) -> bool:
+        """Whether stdout is an interactive terminal rather than a pipe or file.
+
+        Checked at paint time, since stdout may be redirected after the menu
+        is created.
+        """
+        out = sys.stdout
+        return out is not None and out.isatty()
+    
+    def _recompute_cache(self) -> None:
+        """Rebuild the width-dependent border and padding strings."""
+        horizontal = self._rep("═", self.content_width)
+        self._pad = self._rep(" ", self.content_width)
+        self._empty = f"║{self._pad}║\n"
+        self._sep_line = f"╠{horizontal}╣\n"
+        self._top = f"╔{horizontal}╗\n"
+        self._bot = f"╚{horizontal}╝"
     
     def clear_terminal(self) -> None:
-        """Clear the terminal screen."""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        """Clear the terminal screen (no-op when stdout is not a terminal)."""
+        if not self._is_tty:
+            return
+        self._prev_lines = []
+        if self._clear_seq:
+            sys.stdout.write(self._clear_seq)
+            sys.stdout.flush()
+        else:
+            sys.stdout.flush()
+            _win32_clear()
     
     def clear_menu(self) -> None:
         """Clear all lines from the current menu."""
@@ -51,6 +249,20 @@ class TerminalMenu:
         self.add_centered_line(title)
         self.add_empty_line()
     
+    @staticmethod
+    def _trunc(text: str, width: int) -> str:
+        """
+        Truncate text with an ellipsis if it does not fit.
+        
+        Arguments:
+            text: The text to fit
+            width: Available width
+            
+        Returns:
+            The original text object when it fits, otherwise a shortened copy
+        """
+        return text if len(text) <= width else text[:width - 3] + "..."
+    
     def add_centered_line(self, text: str) -> None:
         """
         Add a centered line of text to the menu.
@@ -58,12 +270,8 @@ class TerminalMenu:
         Arguments:
             text: The text to center and add
         """
-        if len(text) > self.content_width:
-            # If text is too long, truncate with ellipsis
-            text = text[:self.content_width - 3] + "..."
-        
-        centered_text = text.center(self.content_width)
-        self.lines.append(f"║{centered_text}║")
+        centered_text = self._trunc(text, self.content_width).center(self.content_width)
+        self.lines.extend(("║", centered_text, "║\n"))
     
     def add_left_aligned_line(self, text: str, indent: int = 2) -> None:
         """
@@ -73,23 +281,17 @@ class TerminalMenu:
             text: The text to add
             indent: Number of spaces to indent from the left
         """
-        available_width = self.content_width - indent
-        if len(text) > available_width:
-            # If text is too long, truncate with ellipsis
-            text = text[:available_width - 3] + "..."
-        
+        text = self._trunc(text, self.content_width - indent)
         padded_text = (" " * indent + text).ljust(self.content_width)
-        self.lines.append(f"║{padded_text}║")
+        self.lines.extend(("║", padded_text, "║\n"))
     
     def add_empty_line(self) -> None:
         """Add an empty line to the menu."""
-        empty_line = " " * self.content_width
-        self.lines.append(f"║{empty_line}║")
+        self.lines.append(self._empty)
     
     def add_separator(self) -> None:
         """Add a horizontal separator line to the menu."""
-        separator = "═" * self.content_width
-        self.lines.append(f"╠{separator}╣")
+        self.lines.append(self._sep_line)
     
     def add_vertical_divider_line(self, text_left: str = "", text_right: str = "", split_ratio: float = 0.5) -> None:
         """
@@ -104,17 +306,11 @@ class TerminalMenu:
         left_width = int(self.content_width * split_ratio) - 1  # -1 for divider
         right_width = self.content_width - left_width - 1  # -1 for divider
         
-        # Truncate text if too long
-        if len(text_left) > left_width:
-            text_left = text_left[:left_width - 3] + "..."
-        if len(text_right) > right_width:
-            text_right = text_right[:right_width - 3] + "..."
-        
-        # Pad text to fill the width
-        padded_left = text_left.ljust(left_width)
-        padded_right = text_right.ljust(right_width)
+        # Truncate and pad text to fill the width
+        padded_left = self._trunc(text_left, left_width).ljust(left_width)
+        padded_right = self._trunc(text_right, right_width).ljust(right_width)
         
-        self.lines.append(f"║{padded_left}│{padded_right}║")
+        self.lines.extend(("║", padded_left, "│", padded_right, "║\n"))
     
     def add_option(self, key: str, description: str, indent: int = 4) -> None:
         """
@@ -139,8 +335,16 @@ class TerminalMenu:
         Returns:
             The complete window as a string
         """
-        # Clear existing content
+        key = (self.width, title, tuple(content_lines) if content_lines else ())
+        cached = self._window_cache.get(key)
+        if cached is not None:
+            window, fragments = cached
+            self.lines[:] = fragments
+            return window
+        
+        # Clear existing content and start with the top border
         self.clear_menu()
+        self.lines.append(self._top)
         
         # Add title if provided
         if title:
@@ -148,54 +352,68 @@ class TerminalMenu:
         
         # Add content lines if provided
         if content_lines:
+            keyword_handlers = self._keyword_handlers
+            prefix_handlers = self._prefix_handlers
             for line in content_lines:
                 if line.strip() == "":
                     self.add_empty_line()
-                elif line == "VERTICAL_START":
-                    # Mark for vertical section (visual only, no action needed)
                     continue
-                elif line == "VERTICAL_END":
-                    # End of vertical section
+                
+                if line in keyword_handlers:
+                    handler = keyword_handlers[line]
+                    if handler:
+                        handler()
                     continue
-                elif line == "VERTICAL_SEP":
-                    # Small visual separator within vertical section
-                    self.add_empty_line()
-                elif line.startswith("COLUMNS:"):
-                    # Add pre-formatted column line
-                    column_content = line[8:]  # Remove "COLUMNS:" prefix
-                    self.lines.append(f"║{column_content}║")
-                elif line.startswith("SEPARATOR"):
+                
+                colon: int = line.find(":")
+                if colon > 0:
+                    handler = prefix_handlers.get(line[:colon])
+                    if handler is not None:
+                        handler(line[colon + 1:])
+                        continue
+                
+                if line.startswith("SEPARATOR"):
                     self.add_separator()
-                elif line.startswith("CENTER:"):
-                    self.add_centered_line(line[7:])
-                elif line.startswith("LEFT:"):
-                    parts = line[5:].split("|", 1)
-                    text = parts[0] if parts else ""
-                    indent = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 2
-                    self.add_left_aligned_line(text, indent)
-                elif line.startswith("OPTION:"):
-                    parts = line[7:].split("|", 2)
-                    key = parts[0] if len(parts) > 0 else ""
-                    desc = parts[1] if len(parts) > 1 else ""
-                    indent = int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else 4
-                    self.add_option(key, desc, indent)
                 else:
                     # Default to left-aligned with default indent
                     self.add_left_aligned_line(line)
         
-        # Build the complete window
-        window_lines = []
-        
-        # Top border
-        window_lines.append("╔" + "═" * self.content_width + "╗")
+        # Build the complete window: the fragments already carry their frame
+        # characters and newlines, so closing the list with the bottom border
+        # lets it be joined as-is without copying it into a new list
+        self.lines.append(self._bot)
+        window: str = "".join(self.lines)
+        _cache_put(self._window_cache, key, (window, tuple(self.lines)))
+        return window
+    
+    def _add_columns_line(self, column_content: str) -> None:
+        """
+        Add a pre-formatted column row (the body of a COLUMNS: line).
         
-        # Content lines
-        window_lines.extend(self.lines)
+        Arguments:
+            column_content: Row already padded to the content width
+        """
+        self.lines.extend(("║", column_content, "║\n"))
+    
+    def _add_left_spec(self, spec: str) -> None:
+        """
+        Add a left-aligned line from the body of a LEFT: line.
         
-        # Bottom border
-        window_lines.append("╚" + "═" * self.content_width + "╝")
+        Arguments:
+            spec: "text" or "text|indent"
+        """
+        text, indent = _LEFT_SPEC_RE.match(spec).groups()
+        self.add_left_aligned_line(text, int(indent) if indent else 2)
+    
+    def _add_option_spec(self, spec: str) -> None:
+        """
+        Add a menu option from the body of an OPTION: line.
         
-        return "\n".join(window_lines)
+        Arguments:
+            spec: "key|description" or "key|description|indent"
+        """
+        key, desc, indent = _OPTION_SPEC_RE.match(spec).groups()
+        self.add_option(key, desc or "", int(indent) if indent else 4)
     
     def display_window(self, title: Optional[str] = None, content_lines: Optional[List[str]] = None, clear_first: bool = True) -> None:
         """
@@ -205,13 +423,54 @@ class TerminalMenu:
             title: Optional title for the window
             content_lines: Optional list of content lines to add
             clear_first: Whether to clear the terminal before displaying
+                - When False and the previous window was painted on a cleared
+                  screen with the same number of rows, only changed rows are redrawn,
+                  provided the window and a prompt row below it fit on the screen
         """
-        if clear_first:
-            self.clear_terminal()
-        
         window = self.create_window(title, content_lines)
-        print(window)
-        print()  # Add extra line after menu
+        out = sys.stdout
+        is_tty = self._is_tty
+        
+        if not (is_tty and self._clear_seq):
+            # No cursor addressing: always paint the whole window. Pipes and
+            # files keep their own buffering; only a console is flushed.
+            if clear_first and is_tty:
+                self.clear_terminal()
+            out.write(f"{window}\n\n")
+            if is_tty:
+                out.flush()
+            # Any earlier window is no longer known to be on screen
+            self._prev_lines = []
+            return
+        
+        rows = window.split("\n")
+        prev_rows = self._prev_lines
+        # Rows are addressed absolutely, which is only valid while the window
+        # still starts on the first screen row.  It must fit with the blank
+        # row, the prompt row and the newline of the answer below it, or the
+        # screen has scrolled since it was painted.
+        fits = len(rows) + 3 <= shutil.get_terminal_size().lines
+        if not clear_first and fits and len(prev_rows) == len(rows):
+            # Rewrite only the rows that changed, then leave the cursor where
+            # a full paint would, erasing whatever was printed below
+            damaged = [
+                f"\x1b[{row};1H{text}"
+                for row, (old, text) in enumerate(zip(prev_rows, rows), 1)
+                if old != text
+            ]
+            damaged.append(f"\x1b[{len(rows) + 2};1H\x1b[J")
+            out.write("".join(damaged))
+            out.flush()
+            self._prev_lines = rows
+            return
+        
+        # Send clear sequence, window and trailing blank line as one write
+        prefix = self._clear_seq if clear_first else ""
+        out.write(f"{prefix}{window}\n\n")
+        out.flush()
+        # Without a clear the window lands wherever the cursor was, and a
+        # window taller than the screen scrolls its top rows away
+        self._prev_lines = rows if clear_first and fits else []
     
     def create_simple_menu(self, content_structure: List) -> None:
         """
@@ -220,7 +479,7 @@ class TerminalMenu:
         Arguments:
             content_structure: List containing strings or nested lists
                 - String elements are added as full-width lines
-                - Nested lists create columns divided by vertical lines (│)
+                - Nested lists (or tuples) create columns divided by vertical lines (│)
                 - Each top-level element is separated by horizontal lines (═)
                 - Use commas (,) within a column string to create multiple lines in that column
                 
@@ -256,6 +515,20 @@ class TerminalMenu:
                     ["LEFT:Item 1, LEFT:Item 2, LEFT:Item 3", "RIGHT:Value A, RIGHT:Value B, RIGHT:Value C"]
                 ]
         """
+        if all(type(element) is str for element in content_structure):
+            # Only full-width lines: interleave them with separators directly,
+            # no column layout or content caching needed
+            content = ["SEPARATOR"] * (2 * len(content_structure) - 1)
+            content[::2] = content_structure
+            self.display_window(None, content)
+            return
+        
+        key = (self.width, _freeze(content_structure))
+        cached = self._content_cache.get(key)
+        if cached is not None:
+            self.display_window(None, cached)
+            return
+        
         content = []
         
         # Process the content structure
@@ -264,13 +537,15 @@ class TerminalMenu:
             if i > 0:
                 content.append("SEPARATOR")
             
-            if isinstance(element, str):
+            element_type = type(element)
+            if element_type is str:
                 # Simple string element - add as full-width line
                 content.append(element)
-            elif isinstance(element, list):
+            elif element_type is list or element_type is tuple:
                 # List element - create columns with vertical divisions
                 self._add_columns(element, content)
         
+        _cache_put(self._content_cache, key, content)
         self.display_window(None, content)
     
     def _add_columns(self, columns: List[str], content: List[str]) -> None:
@@ -286,80 +561,69 @@ class TerminalMenu:
         if not columns:
             return
         
-        num_columns = len(columns)
+        num_columns: int = len(columns)
         if num_columns == 1:
             # Single column, just add as normal line(s)
-            # Check if it contains commas for multi-line content
-            if "," in columns[0]:
-                lines = [line.strip() for line in columns[0].split(",")]
-                for line in lines:
-                    content.append(line)
-            else:
-                content.append(columns[0])
+            content.extend(_parse_multiline(columns[0]))
             return
         
         # Calculate column widths (equal distribution with space for dividers)
-        divider_space = num_columns - 1  # Number of │ characters needed
-        available_width = self.content_width - divider_space
-        col_width = available_width // num_columns
+        divider_space: int = num_columns - 1  # Number of │ characters needed
+        available_width: int = self.content_width - divider_space
+        # More columns than the width allows leave no room for text: clamp at
+        # zero, since a negative width cannot go into a format specifier
+        col_width: int = max(available_width // num_columns, 0)
+        
+        # Truncate-and-pad specifiers, built once per row of columns.
+        # CENTER keeps str.center: its odd-padding placement differs from "^".
+        fmt_left: str = f"{{:<{col_width}.{col_width}}}"
+        fmt_right: str = f"{{:>{col_width}.{col_width}}}"
+        empty_cell: str = self._rep(" ", col_width)
         
         # Parse each column to extract lines (comma-separated) and formatting
-        parsed_columns = []
-        max_lines = 1
+        parsed_columns: List[Tuple[str, ...]] = []
+        max_lines: int = 1
         
         for col_text in columns:
-            # Check if column contains commas (multi-line content)
-            if "," in col_text:
-                # Split by comma to get multiple lines
-                lines = [line.strip() for line in col_text.split(",")]
-                max_lines = max(max_lines, len(lines))
-                parsed_columns.append(lines)
-            else:
-                # Single line
-                parsed_columns.append([col_text])
-        
-        # Generate each row of the multi-line columns
-        for line_idx in range(max_lines):
-            column_parts = []
+            # Commas split a column into multiple lines
+            lines = _parse_multiline(col_text)
+            max_lines = max(max_lines, len(lines))
+            parsed_columns.append(lines)
+        
+        def format_cell(col_text: str) -> str:
+            # Extract formatting prefix if present
+            format_type, sep, text = col_text.partition(":")
+            align = _CELL_ALIGN.get(format_type) if sep else None
+            if align is None:
+                # No format specified, default to left-aligned with indent
+                if col_text:
+                    return fmt_left.format("  " + col_text)
+                return empty_cell
             
-            for col_idx, col_lines in enumerate(parsed_columns):
-                # Get the text for this line (or empty if this column has fewer lines)
-                if line_idx < len(col_lines):
-                    col_text = col_lines[line_idx]
-                else:
-                    col_text = ""
-                
-                # Extract formatting prefix if present
-                if col_text and ":" in col_text and col_text.split(":", 1)[0] in ["CENTER", "LEFT", "RIGHT", "OPTION"]:
-                    format_type, text = col_text.split(":", 1)
-                    
-                    # Handle OPTION format
-                    if format_type == "OPTION":
-                        parts = text.split("|", 2)
-                        key = parts[0] if len(parts) > 0 else ""
-                        desc = parts[1] if len(parts) > 1 else ""
-                        text = f"{key} → {desc}"
-                    
-                    # Format the text based on type
-                    if format_type == "CENTER":
-                        formatted = text[:col_width].center(col_width)
-                    elif format_type == "RIGHT":
-                        formatted = text[:col_width].rjust(col_width)
-                    else:  # LEFT or OPTION
-                        formatted = ("  " + text)[:col_width].ljust(col_width)
-                else:
-                    # No format specified, default to left-aligned with indent
-                    if col_text:
-                        formatted = ("  " + col_text)[:col_width].ljust(col_width)
-                    else:
-                        # Empty cell
-                        formatted = " " * col_width
-                
-                column_parts.append(formatted)
+            # Handle OPTION format
+            if format_type == "OPTION":
+                key, desc, _indent = _OPTION_SPEC_RE.match(text).groups()
+                text = f"{key} → {desc or ''}"
             
-            # Join columns with vertical divider
-            column_line = "│".join(column_parts)
-            content.append(f"COLUMNS:{column_line}")
+            # Format the text based on type
+            if align == "^":
+                return text[:col_width].center(col_width)
+            if align == ">":
+                return fmt_right.format(text)
+            return fmt_left.format("  " + text)  # LEFT or OPTION
+        
+        # Format column by column, padding shorter columns with empty cells,
+        # then stitch the rows together with the vertical divider. Cells hold
+        # multi-byte characters (│, ✓, →), so a byte buffer indexed by column
+        # offset would split them; a single join per row is the cheapest
+        # equivalent and beats refilling a preallocated row list.
+        formatted_columns: List[List[str]] = []
+        for col_lines in parsed_columns:
+            cells = [format_cell(col_text) for col_text in col_lines]
+            cells.extend([empty_cell] * (max_lines - len(cells)))
+            formatted_columns.append(cells)
+        
+        content.extend(f"COLUMNS:{'│'.join(row)}" for row in zip(*formatted_columns))
     
     def create_menu_with_title(self, title: str, content_structure: List, subtitle: Optional[str] = None) -> None:
         """
@@ -400,6 +664,7 @@ class TerminalMenu:
         if width:
             self.width = width
             self.content_width = self.width - 2
+            self._recompute_cache()
         
         content = [f"CENTER:{message}"]
         self.display_window(title, content)
@@ -408,6 +673,7 @@ class TerminalMenu:
         if width:
             self.width = original_width
             self.content_width = self.width - 2
+            self._recompute_cache()
     
     def create_error_window(self, error_message: str) -> None:
         """
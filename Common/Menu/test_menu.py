@@ -2,11 +2,7 @@
 Test script to demonstrate the Common Menu capabilities.
 """
 
-import sys
-import os
-
-# Add parent directory to path to import Common modules
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Run from the repository root, e.g. python -m Common.Menu.test_menu
 from Common.Menu import TerminalMenu
 
 
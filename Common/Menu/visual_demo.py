@@ -2,11 +2,7 @@
 Visual demonstration of the menu system's capabilities.
 """
 
-import sys
-import os
-
-# Add parent directory to path to import Common modules
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Run from the repository root, e.g. python -m Common.Menu.visual_demo
 from Common.Menu import TerminalMenu
 
 
@@ -9,12 +9,21 @@ Provides:
 
 from __future__ import annotations
 
+import bisect
 import difflib
+import hashlib
+import mmap
 import os
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from pathlib import Path
-from typing import List, Optional, Sequence, Tuple
+from functools import lru_cache
+from itertools import repeat
+from math import isqrt
+from typing import BinaryIO, Iterator, List, Optional, Sequence, Tuple
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -30,7 +39,7 @@ class LineTag(Enum):
     HUNK    = auto()      # @@ hunk separator (visual only)
 
 
-@dataclass
+@dataclass(slots=True)
 class CharSpan:
     """A run of characters within a line with a tag for highlighting."""
     start: int
@@ -38,7 +47,7 @@ class CharSpan:
     tag: str   # "equal", "insert", "delete", "replace"
 
 
-@dataclass
+@dataclass(slots=True)
 class DiffLine:
     """One line in a two-way diff result."""
     tag: LineTag
@@ -57,25 +66,396 @@ class FileState(Enum):
     REMOVED  = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class FileDiff:
     """Comparison result for a single file within a directory diff."""
     rel_path: str
     state: FileState
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# Line-level opcodes
+# ═══════════════════════════════════════════════════════════════════════════
+
+# (tag, i1, i2, j1, j2) as returned by SequenceMatcher.get_opcodes()
+Opcode = Tuple[str, int, int, int, int]
+
+
+def _same_lines(a: Sequence[str], b: Sequence[str]) -> bool:
+    """Return True if *a* and *b* hold the same lines."""
+    if a is b:
+        return True
+    if len(a) != len(b):
+        return False
+    if type(a) is type(b):
+        return a == b
+    return list(a) == list(b)
+
+
+def _trim(a: Sequence, b: Sequence) -> Tuple[int, int, Sequence, Sequence]:
+    """Split off the common prefix and suffix of *a* and *b*.
+
+    Returns ``(prefix_len, suffix_len, a_middle, b_middle)``; the suffix
+    never overlaps the prefix.
+    """
+    n = min(len(a), len(b))
+    pfx = 0
+    while pfx < n and a[pfx] == b[pfx]:
+        pfx += 1
+    sfx = 0
+    limit = n - pfx
+    while sfx < limit and a[-1 - sfx] == b[-1 - sfx]:
+        sfx += 1
+    return pfx, sfx, a[pfx:len(a) - sfx], b[pfx:len(b) - sfx]
+
+
+def _intern(lines: Sequence[str], ids: dict[str, int]) -> List[int]:
+    """Map each line to a small int id, adding unseen lines to *ids*."""
+    setdefault = ids.setdefault
+    return [setdefault(line, len(ids)) for line in lines]
+
+
+_MIN_MAX_COST = 256   # smallest edit-cost limit of a single middle-snake search
+
+
+def _middle_snake(
+    a: Sequence[int], a_lo: int, a_hi: int,
+    b: Sequence[int], b_lo: int, b_hi: int,
+    max_cost: int,
+) -> Tuple[int, int, int, int, int]:
+    """Find the middle snake of ``a[a_lo:a_hi]`` vs ``b[b_lo:b_hi]``.
+
+    Runs Myers' search from both ends at once until the paths meet.
+    Returns ``(d, x, y, u, v)``: the edit distance and the snake from
+    ``(x, y)`` to ``(u, v)``, relative to ``a_lo`` / ``b_lo``.
+
+    Once the search has gone *max_cost* steps without the paths meeting,
+    it gives up on a minimal split, as git's xdiff does: the returned
+    snake is empty and sits at the end of whichever path (forward or
+    backward) has covered the most of both sequences.  The diff stays
+    correct but may be longer than minimal.
+    """
+    n = a_hi - a_lo
+    m = b_hi - b_lo
+    delta = n - m
+    odd = delta & 1
+    off = (n + m + 1) // 2 + 1
+    vf = [0] * (2 * off + 1)    # furthest x per diagonal, forward
+    vb = [0] * (2 * off + 1)    # furthest x per diagonal, from the end
+
+    for d in range(off):
+        # Forward search
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and vf[off + k - 1] < vf[off + k + 1]):
+                x = vf[off + k + 1]
+            else:
+                x = vf[off + k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[a_lo + x] == b[b_lo + y]:
+                x += 1
+                y += 1
+            vf[off + k] = x
+            if odd and -d < delta - k < d and x + vb[off + delta - k] >= n:
+                return 2 * d - 1, x0, y0, x, y
+
+        # Backward search, on the reversed sequences
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and vb[off + k - 1] < vb[off + k + 1]):
+                x = vb[off + k + 1]
+            else:
+                x = vb[off + k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[a_hi - 1 - x] == b[b_hi - 1 - y]:
+                x += 1
+                y += 1
+            vb[off + k] = x
+            if not odd and -d <= delta - k <= d and x + vf[off + delta - k] >= n:
+                return 2 * d, n - x, m - y, n - x0, m - y0
+
+        if d >= max_cost:
+            return (2 * d,) + _furthest_split(vf, vb, off, d, n, m) * 2
+
+    raise AssertionError("middle snake not found")
+
+
+def _furthest_split(
+    vf: List[int], vb: List[int], off: int, d: int, n: int, m: int,
+) -> Tuple[int, int]:
+    """Split point for :func:`_middle_snake` when its cost limit is hit.
+
+    Picks the furthest point reached on any diagonal of the forward or
+    the backward search, measured as ``x + y``, in forward coordinates.
+    """
+    best, split = 0, (n // 2, m // 2)
+    for k in range(-d, d + 1, 2):
+        x = vf[off + k]
+        y = x - k
+        if x <= n and 0 <= y <= m and x + y > best:
+            best, split = x + y, (x, y)
+        x = vb[off + k]
+        y = x - k
+        if x <= n and 0 <= y <= m and x + y > best:
+            best, split = x + y, (n - x, m - y)
+    return split
+
+
+def _myers_opcodes(
+    a: Sequence[int], b: Sequence[int],
+) -> List[Opcode]:
+    """Return ``SequenceMatcher``-style opcodes for a minimal diff of *a* → *b*.
+
+    Uses Myers' O(ND) algorithm in its linear-space form: the middle
+    snake splits each region in two until only common prefixes and
+    suffixes remain.  Items that never occur on the other side cannot be
+    matched, so they are dropped before the search and the matches are
+    mapped back to the original positions afterwards.
+    """
+    in_b = set(b)
+    a_keep = [i for i, item in enumerate(a) if item in in_b]
+    in_a = set(a)
+    b_keep = [j for j, item in enumerate(b) if item in in_a]
+    fa = [a[i] for i in a_keep]
+    fb = [b[j] for j in b_keep]
+
+    # Past this many edit steps per split the search takes a heuristic
+    # split instead of a minimal one (xdiff's bound: sqrt of the input
+    # size, at least _MIN_MAX_COST), which keeps big rewrites from going
+    # quadratic
+    max_cost = max(_MIN_MAX_COST, isqrt(len(fa) + len(fb)))
+    found: List[Tuple[int, int, int]] = []
+    pending = [(0, len(fa), 0, len(fb))]
+    while pending:
+        a_lo, a_hi, b_lo, b_hi = pending.pop()
+
+        # Common prefix and suffix are matched directly
+        start = a_lo
+        while a_lo < a_hi and b_lo < b_hi and fa[a_lo] == fb[b_lo]:
+            a_lo += 1
+            b_lo += 1
+        if a_lo > start:
+            found.append((start, b_lo - (a_lo - start), a_lo - start))
+        end = a_hi
+        while a_lo < a_hi and b_lo < b_hi and fa[a_hi - 1] == fb[b_hi - 1]:
+            a_hi -= 1
+            b_hi -= 1
+        if a_hi < end:
+            found.append((a_hi, b_hi, end - a_hi))
+        if a_lo == a_hi or b_lo == b_hi:
+            continue
+
+        _d, x, y, u, v = _middle_snake(fa, a_lo, a_hi, fb, b_lo, b_hi, max_cost)
+        if u > x:
+            found.append((a_lo + x, b_lo + y, u - x))
+        pending.append((a_lo, a_lo + x, b_lo, b_lo + y))
+        pending.append((a_lo + u, a_hi, b_lo + v, b_hi))
+
+    # Map the matches back to the original positions, splitting a match
+    # wherever dropped items sat between its lines
+    blocks: List[Tuple[int, int, int]] = []
+    for fi, fj, size in sorted(found):
+        for t in range(size):
+            ai = a_keep[fi + t]
+            bj = b_keep[fj + t]
+            if blocks:
+                pi, pj, psize = blocks[-1]
+                if pi + psize == ai and pj + psize == bj:
+                    blocks[-1] = (pi, pj, psize + 1)
+                    continue
+            blocks.append((ai, bj, 1))
+
+    return _blocks_to_opcodes(blocks, len(a), len(b))
+
+
+def _blocks_to_opcodes(
+    blocks: List[Tuple[int, int, int]], n: int, m: int,
+) -> List[Opcode]:
+    """Turn sorted, non-adjacent matching blocks ``(i, j, size)`` into opcodes."""
+    opcodes: List[Opcode] = []
+    i = j = 0
+    for ai, bj, size in blocks + [(n, m, 0)]:
+        if i < ai and j < bj:
+            opcodes.append(("replace", i, ai, j, bj))
+        elif i < ai:
+            opcodes.append(("delete", i, ai, j, bj))
+        elif j < bj:
+            opcodes.append(("insert", i, ai, j, bj))
+        if size:
+            opcodes.append(("equal", ai, ai + size, bj, bj + size))
+        i, j = ai + size, bj + size
+    return opcodes
+
+
+def _line_opcodes(
+    a: Sequence[str],
+    b: Sequence[str],
+    ids: Optional[dict[str, int]] = None,
+    a_ids: Optional[List[int]] = None,
+) -> List[Opcode]:
+    """Return ``SequenceMatcher.get_opcodes()``-style opcodes for two line sequences.
+
+    Identical inputs yield a single ``equal`` opcode.  Otherwise the
+    common prefix and suffix are split off, and only the lines between
+    them are interned to ints (via *ids*, which may be shared between
+    calls) and diffed with Myers' algorithm, which gives a minimal edit
+    script and scales with the size of the change rather than the file.
+    *a_ids* may carry *a* already interned through *ids*, for callers
+    that diff the same *a* against several sequences.
+    """
+    if _same_lines(a, b):
+        return [("equal", 0, len(a), 0, len(b))] if a else []
+    pfx, sfx, a_mid, b_mid = _trim(a, b)
+    if ids is None:
+        ids = {}
+
+    opcodes: List[Opcode] = []
+    if pfx:
+        opcodes.append(("equal", 0, pfx, 0, pfx))
+    opcodes.extend(
+        (op, i1 + pfx, i2 + pfx, j1 + pfx, j2 + pfx)
+        for op, i1, i2, j1, j2 in _myers_opcodes(
+            a_ids[pfx:len(a) - sfx] if a_ids is not None else _intern(a_mid, ids),
+            _intern(b_mid, ids),
+        )
+    )
+    if sfx:
+        opcodes.append(("equal", len(a) - sfx, len(a), len(b) - sfx, len(b)))
+    return opcodes
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # Character-level diff within a line pair
 # ═══════════════════════════════════════════════════════════════════════════
 
+_BITPARALLEL_MAX = 64   # longest line text handled by _bitparallel_opcodes
+_MAX_LENGTH_SKEW = 0.8  # length difference (fraction of the longer line) beyond which lines are not char-diffed
+_MIN_EQUAL_ISLAND = 3   # shorter equal runs between two changes are highlighted as changed
+
+
+def _bitparallel_opcodes(a: str, b: str) -> List[Opcode]:
+    """Return opcodes for a longest common subsequence of *a* and *b*.
+
+    Bit-vector LCS (Allison–Dix / Hyyrö): each row of the LCS table is
+    one int whose zero bits mark the columns where the row's LCS length
+    grows, so a row costs a few int operations instead of a loop over
+    *b*.  The rows are kept for the traceback.
+    """
+    m = len(b)
+    masks: dict[str, int] = {}
+    for j, ch in enumerate(b):
+        masks[ch] = masks.get(ch, 0) | (1 << j)
+    full = (1 << m) - 1
+    v = full
+    rows = [v]
+    for ch in a:
+        u = v & masks.get(ch, 0)
+        v = ((v + u) | (v - u)) & full
+        rows.append(v)
+
+    # Walk back from the bottom-right corner; LCS(i, j) is the number of
+    # zero bits among the low j bits of row i
+    blocks: List[Tuple[int, int, int]] = []
+    i, j = len(a), m
+    while i and j:
+        if a[i - 1] == b[j - 1]:
+            i -= 1
+            j -= 1
+            if blocks and blocks[-1][0] == i + 1 and blocks[-1][1] == j + 1:
+                blocks[-1] = (i, j, blocks[-1][2] + 1)
+            else:
+                blocks.append((i, j, 1))
+        elif (rows[i - 1] & ((1 << j) - 1)).bit_count() == (rows[i] & ((1 << j) - 1)).bit_count():
+            i -= 1
+        else:
+            j -= 1
+    blocks.reverse()
+    return _blocks_to_opcodes(blocks, len(a), m)
+
+
+def _absorb_short_equals(opcodes: List[Opcode]) -> List[Opcode]:
+    """Fold equal runs shorter than ``_MIN_EQUAL_ISLAND`` into the changes around them.
+
+    An exact LCS happily matches stray letters inside otherwise rewritten
+    words, which scatters a line into one-character highlights.  Treating
+    such islands as changed keeps each edit in one piece, and because it
+    runs on the output of both matchers the highlighting looks the same
+    whichever of them a line went through.
+    """
+    merged: List[List] = []
+    last = len(opcodes) - 1
+    for k, (op, i1, i2, j1, j2) in enumerate(opcodes):
+        if op == "equal" and (i2 - i1 >= _MIN_EQUAL_ISLAND or k == 0 or k == last):
+            merged.append([op, i1, i2, j1, j2])
+        elif merged and merged[-1][0] != "equal":
+            merged[-1][2] = i2
+            merged[-1][4] = j2
+        else:
+            merged.append(["replace", i1, i2, j1, j2])
+    result: List[Opcode] = []
+    for op, i1, i2, j1, j2 in merged:
+        if op != "equal":
+            op = "replace" if i1 < i2 and j1 < j2 else "delete" if i1 < i2 else "insert"
+        result.append((op, i1, i2, j1, j2))
+    return result
+
+
 def _char_diff(
     old_line: str, new_line: str,
 ) -> Tuple[List[CharSpan], List[CharSpan]]:
-    """Return per-character highlight spans for *old_line* vs *new_line*."""
-    sm = difflib.SequenceMatcher(None, old_line, new_line, autojunk=False)
+    """Return per-character highlight spans for *old_line* vs *new_line*.
+
+    Lines that are empty, share no characters or differ wildly in length
+    are highlighted as a whole without running a character diff.
+    """
+    if old_line == new_line:
+        span = [CharSpan(0, len(old_line), "equal")] if old_line else []
+        return span, list(span)
+    longest = max(len(old_line), len(new_line))
+    if (
+        not old_line or not new_line
+        or abs(len(old_line) - len(new_line)) > longest * _MAX_LENGTH_SKEW
+        or set(old_line).isdisjoint(new_line)
+    ):
+        return (
+            [CharSpan(0, len(old_line), "delete")] if old_line else [],
+            [CharSpan(0, len(new_line), "insert")] if new_line else [],
+        )
+    left_spans, right_spans = _char_spans(old_line, new_line)
+    return list(left_spans), list(right_spans)
+
+
+@lru_cache(maxsize=4096)
+def _char_spans(
+    old_line: str, new_line: str,
+) -> Tuple[Tuple[CharSpan, ...], Tuple[CharSpan, ...]]:
+    """Compute the spans behind :func:`_char_diff`, memoized per line pair.
+
+    The same replacement often repeats across a file (a renamed symbol)
+    and across re-diffs of the same files, so pairs are cached.  The
+    common prefix and suffix are matched directly; only the text between
+    them goes through the matcher: the bit-parallel LCS for short text,
+    SequenceMatcher beyond that.  Equal islands of one or two characters
+    between changes are then folded into the change (see
+    :func:`_absorb_short_equals`).
+    """
+    pfx, sfx, old_mid, new_mid = _trim(old_line, new_line)
+    if max(len(old_mid), len(new_mid)) <= _BITPARALLEL_MAX:
+        opcodes = _bitparallel_opcodes(old_mid, new_mid)
+    else:
+        opcodes = difflib.SequenceMatcher(
+            None, old_mid, new_mid, autojunk=False,
+        ).get_opcodes()
     left_spans: List[CharSpan] = []
     right_spans: List[CharSpan] = []
-    for op, i1, i2, j1, j2 in sm.get_opcodes():
+    if pfx:
+        left_spans.append(CharSpan(0, pfx, "equal"))
+        right_spans.append(CharSpan(0, pfx, "equal"))
+    for op, i1, i2, j1, j2 in _absorb_short_equals(opcodes):
+        i1 += pfx
+        i2 += pfx
+        j1 += pfx
+        j2 += pfx
         if op == "equal":
             left_spans.append(CharSpan(i1, i2, "equal"))
             right_spans.append(CharSpan(j1, j2, "equal"))
@@ -86,142 +466,154 @@ def _char_diff(
             left_spans.append(CharSpan(i1, i2, "delete"))
         elif op == "insert":
             right_spans.append(CharSpan(j1, j2, "insert"))
-    return left_spans, right_spans
+    if sfx:
+        left_spans.append(CharSpan(len(old_line) - sfx, len(old_line), "equal"))
+        right_spans.append(CharSpan(len(new_line) - sfx, len(new_line), "equal"))
+    return tuple(left_spans), tuple(right_spans)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
 # Two-way diff
 # ═══════════════════════════════════════════════════════════════════════════
 
-def diff_lines(
-    left_lines: Sequence[str],
-    right_lines: Sequence[str],
-    context: int = 3,
-) -> List[DiffLine]:
-    """Produce a two-way diff with optional context folding.
+def _deleted_lines(lines: Sequence[str], i1: int, i2: int) -> Iterator[DiffLine]:
+    """DELETE rows for ``lines[i1:i2]``, built column by column."""
+    return map(
+        DiffLine, repeat(LineTag.DELETE), range(i1 + 1, i2 + 1),
+        repeat(None), lines[i1:i2], repeat(""),
+    )
 
-    If *context* is ``None`` show all lines; otherwise collapse equal
-    runs longer than 2 × context into hunk separators.
-    """
-    sm = difflib.SequenceMatcher(None, left_lines, right_lines, autojunk=False)
-    raw: List[DiffLine] = []
 
-    for op, i1, i2, j1, j2 in sm.get_opcodes():
+def _inserted_lines(lines: Sequence[str], j1: int, j2: int) -> Iterator[DiffLine]:
+    """INSERT rows for ``lines[j1:j2]``, built column by column."""
+    return map(
+        DiffLine, repeat(LineTag.INSERT), repeat(None),
+        range(j1 + 1, j2 + 1), repeat(""), lines[j1:j2],
+    )
+
+
+def _hunk_line() -> DiffLine:
+    """A hunk separator row."""
+    return DiffLine(
+        tag=LineTag.HUNK, left_lineno=None, right_lineno=None,
+        left_text="", right_text="",
+    )
+
+
+def _raw_diff_lines(
+    left_lines: Sequence[str], right_lines: Sequence[str],
+) -> Iterator[DiffLine]:
+    """Yield every row of the two-way diff, without context folding."""
+    for op, i1, i2, j1, j2 in _line_opcodes(left_lines, right_lines):
         if op == "equal":
-            for k in range(i2 - i1):
-                raw.append(DiffLine(
-                    tag=LineTag.EQUAL,
-                    left_lineno=i1 + k + 1,
-                    right_lineno=j1 + k + 1,
-                    left_text=left_lines[i1 + k],
-                    right_text=right_lines[j1 + k],
-                ))
+            # Build the whole run column by column
+            yield from map(
+                DiffLine,
+                repeat(LineTag.EQUAL, i2 - i1),
+                range(i1 + 1, i2 + 1),
+                range(j1 + 1, j2 + 1),
+                left_lines[i1:i2],
+                right_lines[j1:j2],
+            )
         elif op == "replace":
-            n_old = i2 - i1
-            n_new = j2 - j1
-            n_common = min(n_old, n_new)
-            for k in range(n_common):
-                lt = left_lines[i1 + k]
-                rt = right_lines[j1 + k]
+            # Pair up lines for a character diff; any surplus on one side
+            # becomes plain deletes or inserts
+            n_common = min(i2 - i1, j2 - j1)
+            for left_no, right_no, lt, rt in zip(
+                range(i1 + 1, i1 + n_common + 1),
+                range(j1 + 1, j1 + n_common + 1),
+                left_lines[i1:i1 + n_common],
+                right_lines[j1:j1 + n_common],
+            ):
                 ls, rs = _char_diff(lt, rt)
-                raw.append(DiffLine(
-                    tag=LineTag.REPLACE,
-                    left_lineno=i1 + k + 1,
-                    right_lineno=j1 + k + 1,
-                    left_text=lt,
-                    right_text=rt,
-                    left_char_spans=ls,
-                    right_char_spans=rs,
-                ))
-            # If left has more lines
-            for k in range(n_common, n_old):
-                raw.append(DiffLine(
-                    tag=LineTag.DELETE,
-                    left_lineno=i1 + k + 1,
-                    right_lineno=None,
-                    left_text=left_lines[i1 + k],
-                    right_text="",
-                ))
-            # If right has more lines
-            for k in range(n_common, n_new):
-                raw.append(DiffLine(
-                    tag=LineTag.INSERT,
-                    left_lineno=None,
-                    right_lineno=j1 + k + 1,
-                    left_text="",
-                    right_text=right_lines[j1 + k],
-                ))
+                yield DiffLine(LineTag.REPLACE, left_no, right_no, lt, rt, ls, rs)
+            yield from _deleted_lines(left_lines, i1 + n_common, i2)
+            yield from _inserted_lines(right_lines, j1 + n_common, j2)
         elif op == "delete":
-            for k in range(i2 - i1):
-                raw.append(DiffLine(
-                    tag=LineTag.DELETE,
-                    left_lineno=i1 + k + 1,
-                    right_lineno=None,
-                    left_text=left_lines[i1 + k],
-                    right_text="",
-                ))
+            yield from _deleted_lines(left_lines, i1, i2)
         elif op == "insert":
-            for k in range(j2 - j1):
-                raw.append(DiffLine(
-                    tag=LineTag.INSERT,
-                    left_lineno=None,
-                    right_lineno=j1 + k + 1,
-                    left_text="",
-                    right_text=right_lines[j1 + k],
-                ))
+            yield from _inserted_lines(right_lines, j1, j2)
+
 
+def iter_diff_lines(
+    left_lines: Sequence[str],
+    right_lines: Sequence[str],
+    context: Optional[int] = 3,
+) -> Iterator[DiffLine]:
+    """Yield a two-way diff row by row, folding context on the fly.
+
+    Same rows as :func:`diff_lines`, but produced lazily: at most
+    2 × *context* equal rows are held back while deciding whether they
+    are shown or folded into a hunk separator.
+    """
+    rows = _raw_diff_lines(left_lines, right_lines)
     if context is None:
-        return raw
-
-    # Context folding
-    result: List[DiffLine] = []
-    last_interesting = -1
-    interesting_indices = [
-        i for i, d in enumerate(raw) if d.tag != LineTag.EQUAL
-    ]
-    if not interesting_indices:
+        yield from rows
+        return
+
+    lead: deque[DiffLine] = deque(maxlen=context)   # latest held-back rows
+    tail: List[DiffLine] = []   # first held-back rows (trailing context)
+    held = 0                    # equal rows seen but not yet emitted
+    after = 0                   # equal rows still shown after the last change
+    changed = False
+    for row in rows:
+        if row.tag is LineTag.EQUAL:
+            if after:
+                after -= 1
+                yield row
+            else:
+                held += 1
+                if len(tail) < context:
+                    tail.append(row)
+                lead.append(row)
+            continue
+
+        # A change: show the context before it, folding anything earlier
+        if changed and held > context:
+            yield _hunk_line()
+        yield from lead
+        lead.clear()
+        tail.clear()
+        held = 0
+        yield row
+        after = context
+        changed = True
+
+    if changed:
+        # Trailing context after the last change
+        yield from tail
+        if held > context:
+            yield _hunk_line()
+    elif held > context * 2:
         # All equal — show a summary
-        if len(raw) > context * 2:
-            result.extend(raw[:context])
-            result.append(DiffLine(
-                tag=LineTag.HUNK, left_lineno=None, right_lineno=None,
-                left_text="", right_text="",
-            ))
-            result.extend(raw[-context:])
-        else:
-            result = raw
-        return result
+        yield from tail
+        yield _hunk_line()
+        yield from lead
+    else:
+        yield from tail
+        yield from list(lead)[len(lead) - (held - len(tail)):]
 
-    for idx in interesting_indices:
-        start = max(last_interesting + 1, idx - context)
-        if result and start > last_interesting + 1:
-            result.append(DiffLine(
-                tag=LineTag.HUNK, left_lineno=None, right_lineno=None,
-                left_text="", right_text="",
-            ))
-        for i in range(start, min(idx + context + 1, len(raw))):
-            if i > last_interesting:
-                result.append(raw[i])
-        last_interesting = max(last_interesting, idx + context)
-
-    # Trailing context
-    remaining_start = last_interesting + 1
-    if remaining_start < len(raw):
-        tail = raw[remaining_start: remaining_start + context]
-        if tail:
-            result.extend(tail)
-        if remaining_start + context < len(raw):
-            result.append(DiffLine(
-                tag=LineTag.HUNK, left_lineno=None, right_lineno=None,
-                left_text="", right_text="",
-            ))
 
-    return result
+def diff_lines(
+    left_lines: Sequence[str],
+    right_lines: Sequence[str],
+    context: Optional[int] = 3,
+) -> List[DiffLine]:
+    """Produce a two-way diff with optional context folding.
+
+    If *context* is ``None`` show all lines; otherwise collapse equal
+    runs longer than 2 × context into hunk separators.
+    """
+    return list(iter_diff_lines(left_lines, right_lines, context))
 
 
-def diff_files(left_path: str, right_path: str, context: int = 3) -> List[DiffLine]:
-    """Diff two files by path."""
-    def _read(p):
+def diff_files(
+    left_path: Optional[str], right_path: Optional[str], context: int = 3,
+) -> List[DiffLine]:
+    """Diff two files by path; ``None`` stands for a side known to be absent."""
+    def _read(p: Optional[str]) -> List[str]:
+        if p is None:
+            return []
         try:
             with open(p, encoding="utf-8", errors="replace") as f:
                 return f.read().splitlines()
@@ -239,7 +631,7 @@ class MergeTag(Enum):
     CONFLICT = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class MergeChunk:
     """A chunk in a three-way merge result."""
     tag: MergeTag
@@ -260,49 +652,43 @@ def merge3(
     Auto-resolves when only one side changed a region or both sides
     made the same change.  Otherwise marks a conflict.
     """
-    sm_left = difflib.SequenceMatcher(None, base_lines, left_lines, autojunk=False)
-    sm_right = difflib.SequenceMatcher(None, base_lines, right_lines, autojunk=False)
-
-    left_ops = sm_left.get_opcodes()
-    right_ops = sm_right.get_opcodes()
+    # Both sides are diffed against base: intern it once for the two runs
+    ids: dict[str, int] = {}
+    base_ids = _intern(base_lines, ids)
+    left_ops = _line_opcodes(base_lines, left_lines, ids, base_ids)
+    right_ops = _line_opcodes(base_lines, right_lines, ids, base_ids)
 
     # Build change maps: for each base line, record if left/right changed it
     n_base = len(base_lines)
 
-    # Expand opcodes into per-line flags
-    left_changed = [False] * n_base
-    right_changed = [False] * n_base
-    for op, i1, i2, j1, j2 in left_ops:
-        if op != "equal":
-            for i in range(i1, i2):
-                left_changed[i] = True
-    for op, i1, i2, j1, j2 in right_ops:
-        if op != "equal":
-            for i in range(i1, i2):
-                right_changed[i] = True
+    # Expand opcodes into per-line flags (one byte per base line, set with
+    # slice stores); *changed* marks lines touched by either side
+    left_changed = bytearray(n_base)
+    right_changed = bytearray(n_base)
+    changed = bytearray(n_base)
+    for flags, ops in ((left_changed, left_ops), (right_changed, right_ops)):
+        for op, i1, i2, j1, j2 in ops:
+            if op != "equal" and i2 > i1:
+                ones = b"\x01" * (i2 - i1)
+                flags[i1:i2] = ones
+                changed[i1:i2] = ones
 
     # Process base line by line, grouping into chunks
     chunks: List[MergeChunk] = []
 
-    # Get replacement mappings keyed by base range
-    left_map: dict[Tuple[int, int], List[str]] = {}
-    for op, i1, i2, j1, j2 in left_ops:
-        if op != "equal":
-            left_map[(i1, i2)] = list(left_lines[j1:j2])
-
-    right_map: dict[Tuple[int, int], List[str]] = {}
-    for op, i1, i2, j1, j2 in right_ops:
-        if op != "equal":
-            right_map[(i1, i2)] = list(right_lines[j1:j2])
+    # Opcode start positions in base, for bisecting in _find_replacement
+    left_starts = [op[1] for op in left_ops]
+    right_starts = [op[1] for op in right_ops]
 
-    # Simple approach: walk through base linearly
+    # Walk through base run by run, finding each run's end with find()
     i = 0
     while i < n_base:
-        if not left_changed[i] and not right_changed[i]:
+        if not changed[i]:
             # Both equal — accumulate
             eq_start = i
-            while i < n_base and not left_changed[i] and not right_changed[i]:
-                i += 1
+            i = changed.find(1, i)
+            if i < 0:
+                i = n_base
             chunks.append(MergeChunk(
                 tag=MergeTag.RESOLVED,
                 base_lines=list(base_lines[eq_start:i]),
@@ -313,13 +699,14 @@ def merge3(
         else:
             # Find the extent of the changed region
             ch_start = i
-            while i < n_base and (left_changed[i] or right_changed[i]):
-                i += 1
+            i = changed.find(0, i)
+            if i < 0:
+                i = n_base
             b = list(base_lines[ch_start:i])
 
             # Find left/right replacements for this region
-            l_repl = _find_replacement(left_map, ch_start, i, left_changed, base_lines, left_lines, sm_left)
-            r_repl = _find_replacement(right_map, ch_start, i, right_changed, base_lines, right_lines, sm_right)
+            l_repl = _find_replacement(ch_start, i, left_changed, base_lines, left_lines, left_ops, left_starts)
+            r_repl = _find_replacement(ch_start, i, right_changed, base_lines, right_lines, right_ops, right_starts)
 
             if l_repl == r_repl:
                 # Same change — resolved
@@ -352,15 +739,17 @@ def merge3(
 
     # Handle lines added past the end of base
     # (These are captured in opcodes where i1==i2==n_base)
-    for (i1, i2), repl in left_map.items():
-        if i1 >= n_base and repl:
+    for op, i1, i2, j1, j2 in left_ops:
+        if op != "equal" and i1 >= n_base and j2 > j1:
+            repl = list(left_lines[j1:j2])
             chunks.append(MergeChunk(
                 tag=MergeTag.RESOLVED, base_lines=[],
                 left_lines=repl, right_lines=[],
                 result_lines=repl,
             ))
-    for (i1, i2), repl in right_map.items():
-        if i1 >= n_base and repl:
+    for op, i1, i2, j1, j2 in right_ops:
+        if op != "equal" and i1 >= n_base and j2 > j1:
+            repl = list(right_lines[j1:j2])
             chunks.append(MergeChunk(
                 tag=MergeTag.RESOLVED, base_lines=[],
                 left_lines=[], right_lines=repl,
@@ -371,35 +760,40 @@ def merge3(
 
 
 def _find_replacement(
-    change_map, start, end, changed_flags, base_lines, target_lines, sm,
+    start: int,
+    end: int,
+    changed_flags: bytearray,
+    base_lines: Sequence[str],
+    target_lines: Sequence[str],
+    ops: List[Opcode],
+    starts: List[int],
 ) -> List[str]:
-    """Find what lines replace base[start:end] in the target."""
+    """Find what lines replace base[start:end] in the target.
+
+    *starts* holds the base start of each opcode in *ops*, so the first
+    opcode that can overlap the region is found by bisection.
+    """
     # Check if any base lines in this region were actually changed by this side
-    any_changed = any(changed_flags[k] for k in range(start, end))
-    if not any_changed:
+    if changed_flags.find(1, start, end) < 0:
         return list(base_lines[start:end])
 
     # Find the opcode(s) covering this region
-    result = []
-    covered = set()
-    for op, i1, i2, j1, j2 in sm.get_opcodes():
-        if i2 <= start or i1 >= end:
+    result: List[str] = []
+    for idx in range(max(bisect.bisect_right(starts, start) - 1, 0), len(ops)):
+        op, i1, i2, j1, j2 = ops[idx]
+        if i1 >= end:
+            break
+        if i2 <= start:
             continue
-        # Overlap
+        # Overlap — opcodes are sorted and disjoint, so each is seen once
         if op == "equal":
             # Only include the overlapping equal part
             ov_start = max(i1, start)
             ov_end = min(i2, end)
-            offset = ov_start - i1
-            for k in range(ov_end - ov_start):
-                result.append(target_lines[j1 + offset + k])
-                covered.add(ov_start + k)
+            result.extend(target_lines[j1 + ov_start - i1:j1 + ov_end - i1])
         else:
-            # Changed region — include target lines (only once)
-            key = (i1, i2)
-            if key not in covered:
-                result.extend(target_lines[j1:j2])
-                covered.add(key)
+            # Changed region — include all its target lines
+            result.extend(target_lines[j1:j2])
     return result
 
 
@@ -407,24 +801,137 @@ def _find_replacement(
 # Directory comparison
 # ═══════════════════════════════════════════════════════════════════════════
 
+_COMPARE_CHUNK = 64 * 1024   # bytes read per side per step when comparing files
+_POOL_MIN_FILES = 16          # fewer common files than this are compared inline
+_MMAP_MIN_SIZE = 1024 * 1024  # files at least this large are compared through mmap
+_MMAP_CHUNK = 1024 * 1024     # bytes compared per step on mapped files
+_DIGEST_CACHE_SIZE = 65536    # file digests remembered between comparisons
+
+# BLAKE2 digests of files found identical, keyed by (path, size, mtime_ns);
+# a changed file gets a new key, so stale entries are never hit
+_digests: dict[Tuple[str, int, int], bytes] = {}
+_digests_lock = threading.Lock()   # compare workers store digests concurrently
+
+
+def _remember_digest(key: Tuple[str, int, int], digest: bytes) -> None:
+    """Store a file digest, evicting the oldest entry when full."""
+    with _digests_lock:
+        if len(_digests) >= _DIGEST_CACHE_SIZE:
+            del _digests[next(iter(_digests))]
+        _digests[key] = digest
+
+
 def _collect_files(root: str) -> set[str]:
-    """Return a set of relative posix paths of all files under *root*."""
-    result = set()
-    root_path = Path(root)
-    if not root_path.is_dir():
+    """Return a set of relative posix paths of all files under *root*.
+
+    Symlinked files are included; symlinked directories are not entered.
+    """
+    result: set[str] = set()
+    if not os.path.isdir(root):
         return result
-    for p in root_path.rglob("*"):
-        if p.is_file():
-            result.add(p.relative_to(root_path).as_posix())
+    pending = [(root, "")]
+    while pending:
+        folder, prefix = pending.pop()
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    rel = prefix + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append((entry.path, rel + "/"))
+                    elif entry.is_file():
+                        # Interned: both sides and every refresh share one string
+                        result.add(sys.intern(rel))
+        except OSError:
+            continue
     return result
 
 
+def _compare_file(left_path: str, right_path: str) -> FileState:
+    """Return SAME if both files hold the same bytes, else MODIFIED."""
+    try:
+        # Decide from metadata where possible: different sizes can't match,
+        # and two names for the same inode (hard links) always do
+        st_l = os.stat(left_path)
+        st_r = os.stat(right_path)
+        if st_l.st_size != st_r.st_size:
+            return FileState.MODIFIED
+        if st_l.st_ino and (st_l.st_dev, st_l.st_ino) == (st_r.st_dev, st_r.st_ino):
+            return FileState.SAME
+
+        # Files already seen with the same size and mtime compare by digest
+        key_l = (left_path, st_l.st_size, st_l.st_mtime_ns)
+        key_r = (right_path, st_r.st_size, st_r.st_mtime_ns)
+        digest_l = _digests.get(key_l)
+        digest_r = _digests.get(key_r)
+        if digest_l is not None and digest_r is not None:
+            return FileState.SAME if digest_l == digest_r else FileState.MODIFIED
+
+        # Otherwise compare the bytes, hashing them on the way so an
+        # identical pair can be settled from the cache next time
+        hasher = hashlib.blake2b()
+        with open(left_path, "rb") as fl, open(right_path, "rb") as fr:
+            if st_l.st_size >= _MMAP_MIN_SIZE:
+                state = _compare_mapped(fl, fr, st_l.st_size, hasher)
+            else:
+                state = FileState.SAME
+                while True:
+                    chunk = fl.read(_COMPARE_CHUNK)
+                    if chunk != fr.read(_COMPARE_CHUNK):
+                        state = FileState.MODIFIED
+                        break
+                    if not chunk:
+                        break
+                    hasher.update(chunk)
+        if state is FileState.SAME:
+            digest = hasher.digest()
+            _remember_digest(key_l, digest)
+            _remember_digest(key_r, digest)
+        return state
+    except Exception:
+        return FileState.MODIFIED
+
+
+def _compare_mapped(
+    fl: BinaryIO, fr: BinaryIO, size: int, hasher: hashlib.blake2b,
+) -> FileState:
+    """Compare two open files of *size* bytes through memory maps.
+
+    Slices are compared one at a time, so only the pages up to the first
+    difference are read and no full copy of either file is made.  Matching
+    slices are fed to *hasher*.
+    """
+    with mmap.mmap(fl.fileno(), 0, access=mmap.ACCESS_READ) as mm_l, \
+            mmap.mmap(fr.fileno(), 0, access=mmap.ACCESS_READ) as mm_r:
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            mm_l.madvise(mmap.MADV_SEQUENTIAL)
+            mm_r.madvise(mmap.MADV_SEQUENTIAL)
+        for pos in range(0, size, _MMAP_CHUNK):
+            chunk = mm_l[pos:pos + _MMAP_CHUNK]
+            if chunk != mm_r[pos:pos + _MMAP_CHUNK]:
+                return FileState.MODIFIED
+            hasher.update(chunk)
+    return FileState.SAME
+
+
 def diff_directories(left_dir: str, right_dir: str) -> List[FileDiff]:
     """Compare two directory trees and return per-file status."""
     left_files = _collect_files(left_dir)
     right_files = _collect_files(right_dir)
     all_files = sorted(left_files | right_files)
 
+    # Files present on both sides are compared on a thread pool, as the
+    # work is almost all waiting on the disk; for a handful of files
+    # starting the pool costs more than it saves
+    common = [rel for rel in all_files if rel in left_files and rel in right_files]
+    left_paths = [os.path.join(left_dir, rel) for rel in common]
+    right_paths = [os.path.join(right_dir, rel) for rel in common]
+    if len(common) < _POOL_MIN_FILES:
+        states = dict(zip(common, map(_compare_file, left_paths, right_paths)))
+    else:
+        workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            states = dict(zip(common, pool.map(_compare_file, left_paths, right_paths)))
+
     result: List[FileDiff] = []
     for rel in all_files:
         if rel not in left_files:
@@ -432,16 +939,7 @@ def diff_directories(left_dir: str, right_dir: str) -> List[FileDiff]:
         elif rel not in right_files:
             result.append(FileDiff(rel, FileState.REMOVED))
         else:
-            lp = os.path.join(left_dir, rel)
-            rp = os.path.join(right_dir, rel)
-            try:
-                with open(lp, "rb") as fl, open(rp, "rb") as fr:
-                    if fl.read() == fr.read():
-                        result.append(FileDiff(rel, FileState.SAME))
-                    else:
-                        result.append(FileDiff(rel, FileState.MODIFIED))
-            except Exception:
-                result.append(FileDiff(rel, FileState.MODIFIED))
+            result.append(FileDiff(rel, states[rel]))
     return result
 
 
@@ -17,8 +17,15 @@ from __future__ import annotations
 
 import os
 import sys
+import stat
+import atexit
+import codecs
+import shutil
 import tempfile
+import threading
 import subprocess
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from PyQt6.QtWidgets import (
@@ -27,14 +34,17 @@ from PyQt6.QtWidgets import (
     QMessageBox, QDockWidget, QApplication, QLabel,
     QSplitter, QDialog, QComboBox, QPushButton,
 )
-from PyQt6.QtGui import QAction, QFont, QKeySequence
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QFont, QKeySequence
+from PyQt6.QtCore import (
+    Qt, QTimer, QObject, QRunnable, QThreadPool, QSettings,
+    pyqtSignal, pyqtSlot,
+)
 
 from csaszicompare.themes import (
-    palette, apply_theme, THEME_NAMES, THEME_LABELS,
+    palette, apply_theme, PALETTES, THEME_NAMES, THEME_LABELS,
 )
 from csaszicompare.diff_engine import (
-    diff_files, diff_directories_changed_only, FileDiff, FileState,
+    diff_files, diff_directories_changed_only, DiffLine, FileDiff, FileState,
 )
 from csaszicompare.widgets.file_tree import FileTree
 from csaszicompare.widgets.changed_files import ChangedFilesPanel
@@ -45,6 +55,20 @@ from csaszicompare.widgets.merge_view import ThreeWayMergeView
 class MainWindow(QMainWindow):
     """CsasziCompare main window."""
 
+    # Exported commit trees, keyed by (real repo path, full commit hash).
+    # Commits are immutable, so an export can be reused for the lifetime of
+    # the process (and by every window); the directories go away at exit.
+    _export_cache: dict[tuple[str, str], str] = {}
+    # Exports in progress, keyed like the cache; the event is set once the
+    # export has been published (or has failed)
+    _export_pending: dict[tuple[str, str], threading.Event] = {}
+    # Exported trees a running _ExportJob is still reading → number of jobs
+    _export_in_use: dict[str, int] = {}
+    # Guards the three dicts above; never held while git runs
+    _export_lock = threading.Lock()
+
+    _DIFF_CACHE_SIZE = 64   # computed two-way diffs kept per window
+
     def __init__(
         self,
         left: str = "",
@@ -58,18 +82,34 @@ class MainWindow(QMainWindow):
         parent=None,
     ):
         super().__init__(parent)
-        self._left = left
-        self._right = right
+        self._set_sides(left, right)
         self._base = base
         self._mode = mode     # "compare" or "merge" or "rebase"
         self._repo = repo
         self._commit1 = commit1
         self._commit2 = commit2
-        self._temp_dirs: list[str] = []
         self._git_hash1 = ""    # e.g. "abc12345"
         self._git_hash2 = ""
         self._git_date1 = ""    # e.g. "2025-12-01 14:30"
         self._git_date2 = ""
+        self._export_job: _ExportJob | None = None
+        self._palette_key = _palette_key(theme)   # palette the views were drawn with
+
+        # File dialogs open where the last pick was made, across restarts
+        self._settings = QSettings("Csaszi", "CsasziCompare")
+        self._last_dir: str = self._settings.value("last_dir", "", type=str)
+
+        # Computed diffs keyed on both paths plus their (mtime, size), so
+        # revisiting a file skips the read + diff; cleared by Refresh (F5)
+        self._diff_cache: OrderedDict[tuple, list[DiffLine]] = OrderedDict()
+        self._shown: tuple[str | None, str | None, str, str] | None = None
+
+        # Coalesce rapid selection changes (held arrow keys) into one render
+        self._pending_rel: tuple[str, FileState | None] | None = None
+        self._select_timer = QTimer(self)
+        self._select_timer.setSingleShot(True)
+        self._select_timer.setInterval(80)
+        self._select_timer.timeout.connect(self._flush_selection)
 
         self.setWindowTitle("CsasziCompare")
         self.resize(1400, 900)
@@ -86,53 +126,42 @@ class MainWindow(QMainWindow):
     # Menu bar
     # =====================================================================
 
+    def _menu_spec(self) -> list[tuple[str, list[tuple[str, str, object] | None]]]:
+        """Menu bar contents: (menu title, [(text, shortcut, slot) or None])."""
+        return [
+            ("&File", [
+                ("Compare Two &Files…",       "Ctrl+O", self._prompt_compare_files),
+                ("Compare Two &Directories…", "Ctrl+D", self._prompt_compare_dirs),
+                None,
+                ("Three-Way &Merge…",         "Ctrl+M", self._prompt_merge),
+                None,
+                ("&Quit",                     "Ctrl+Q", self.close),
+            ]),
+            ("&View", [
+                ("&Refresh Diff",             "F5",     self._refresh_diff),
+            ]),
+            ("&Tools", [
+                ("&Settings…",                "",       self._on_settings),
+            ]),
+        ]
+
     def _build_menu(self):
         mb = self.menuBar()
-
-        # ── File ──────────────────────────────────────────────
-        file_menu = mb.addMenu("&File")
-
-        act_cmp_files = QAction("Compare Two &Files…", self)
-        act_cmp_files.setShortcut(QKeySequence("Ctrl+O"))
-        act_cmp_files.triggered.connect(self._prompt_compare_files)
-        file_menu.addAction(act_cmp_files)
-
-        act_cmp_dirs = QAction("Compare Two &Directories…", self)
-        act_cmp_dirs.setShortcut(QKeySequence("Ctrl+D"))
-        act_cmp_dirs.triggered.connect(self._prompt_compare_dirs)
-        file_menu.addAction(act_cmp_dirs)
-
-        file_menu.addSeparator()
-
-        act_merge = QAction("Three-Way &Merge…", self)
-        act_merge.setShortcut(QKeySequence("Ctrl+M"))
-        act_merge.triggered.connect(self._prompt_merge)
-        file_menu.addAction(act_merge)
-
-        file_menu.addSeparator()
-
-        act_quit = QAction("&Quit", self)
-        act_quit.setShortcut(QKeySequence("Ctrl+Q"))
-        act_quit.triggered.connect(self.close)
-        file_menu.addAction(act_quit)
-
-        # ── View ──────────────────────────────────────────────
-        view_menu = mb.addMenu("&View")
-
-        act_refresh = QAction("&Refresh Diff", self)
-        act_refresh.setShortcut(QKeySequence("F5"))
-        act_refresh.triggered.connect(self._refresh_diff)
-        view_menu.addAction(act_refresh)
-
-        # ── Tools ─────────────────────────────────────────────
-        tools_menu = mb.addMenu("&Tools")
-
-        act_settings = QAction("&Settings…", self)
-        act_settings.triggered.connect(self._on_settings)
-        tools_menu.addAction(act_settings)
-
-        # ── Window (dock toggles) ─────────────────────────────
+        for title, entries in self._menu_spec():
+            menu = mb.addMenu(title)
+            for entry in entries:
+                if entry is None:
+                    menu.addSeparator()
+                    continue
+                text, shortcut, slot = entry
+                act = menu.addAction(text)
+                if shortcut:
+                    act.setShortcut(QKeySequence(shortcut))
+                act.triggered.connect(slot)
+
+        # ── Window (dock toggles) — filled in each time it opens ─
         self._window_menu = mb.addMenu("&Window")
+        self._window_menu.aboutToShow.connect(self._populate_window_menu)
 
     # =====================================================================
     # Toolbar
@@ -164,34 +193,39 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(_central)
 
         # ── Create widgets ────────────────────────────────────
+        # The diff and merge views are built on first use (see
+        # _ensure_diff_view / _ensure_merge_view); a compare session never
+        # pays for the merge editors and vice versa.
         self._file_tree = FileTree()
         self._changed_files = ChangedFilesPanel()
-        self._diff_view = TwoWayDiffView()
-        self._merge_view = ThreeWayMergeView()
+        self._diff_view: TwoWayDiffView | None = None
+        self._merge_view: ThreeWayMergeView | None = None
+        self._diff_dock: QDockWidget | None = None
+        self._merge_dock: QDockWidget | None = None
 
         # Connect signals
         self._file_tree.file_selected.connect(self._on_file_tree_select)
         self._changed_files.file_selected.connect(self._on_changed_file_select)
-        self._merge_view.merge_saved.connect(self._on_merge_saved)
 
         # ── Dock widgets ──────────────────────────────────────
         self._tree_dock = self._make_dock("File Explorer", self._file_tree)
         self._files_dock = self._make_dock("Changed Files", self._changed_files)
-        self._diff_dock = self._make_dock("Diff View", self._diff_view)
-        self._merge_dock = self._make_dock("Merge View", self._merge_view)
 
         # Left column: file tree on top, changed files below
         self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self._tree_dock)
         self.splitDockWidget(self._tree_dock, self._files_dock, Qt.Orientation.Vertical)
 
-        # Right column: diff view and merge view as tabs
-        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self._diff_dock)
-        self.tabifyDockWidget(self._diff_dock, self._merge_dock)
-        self._diff_dock.raise_()
+        # Right column: the view for the startup mode
+        if self._mode == "compare":
+            self._ensure_diff_view()
+            view_dock = self._diff_dock
+        else:
+            self._ensure_merge_view()
+            view_dock = self._merge_dock
 
         # Sizes
         self.resizeDocks(
-            [self._tree_dock, self._diff_dock],
+            [self._tree_dock, view_dock],
             [320, 1080],
             Qt.Orientation.Horizontal,
         )
@@ -201,16 +235,6 @@ class MainWindow(QMainWindow):
             Qt.Orientation.Vertical,
         )
 
-        # Show/hide merge dock based on mode
-        if self._mode == "compare":
-            self._merge_dock.setVisible(False)
-        else:
-            self._diff_dock.setVisible(False)
-            self._merge_dock.raise_()
-
-        # Window menu
-        self._populate_window_menu()
-
     def _build_statusbar(self):
         sb = QStatusBar()
         self.setStatusBar(sb)
@@ -230,12 +254,37 @@ class MainWindow(QMainWindow):
         )
         return dock
 
+    def _add_view_dock(self, dock: QDockWidget):
+        """Place a diff/merge dock in the right column, tabbed with the other."""
+        other = self._merge_dock if dock is self._diff_dock else self._diff_dock
+        if other is None:
+            self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, dock)
+        else:
+            self.tabifyDockWidget(other, dock)
+
+    def _ensure_diff_view(self) -> TwoWayDiffView:
+        if self._diff_view is None:
+            self._diff_view = TwoWayDiffView()
+            self._diff_dock = self._make_dock("Diff View", self._diff_view)
+            self._add_view_dock(self._diff_dock)
+        return self._diff_view
+
+    def _ensure_merge_view(self) -> ThreeWayMergeView:
+        if self._merge_view is None:
+            self._merge_view = ThreeWayMergeView()
+            self._merge_view.merge_saved.connect(self._on_merge_saved)
+            self._merge_dock = self._make_dock("Merge View", self._merge_view)
+            self._add_view_dock(self._merge_dock)
+        return self._merge_view
+
     def _populate_window_menu(self):
+        self._window_menu.clear()
         for dock in (
             self._tree_dock, self._files_dock,
             self._diff_dock, self._merge_dock,
         ):
-            self._window_menu.addAction(dock.toggleViewAction())
+            if dock is not None:
+                self._window_menu.addAction(dock.toggleViewAction())
 
     # =====================================================================
     # Theme & Settings
@@ -244,13 +293,17 @@ class MainWindow(QMainWindow):
     def _switch_theme(self, name: str):
         apply_theme(QApplication.instance(), name)
         self._current_theme = name
-        # Re-render diff view to pick up new colours
-        self._diff_view.rerender()
+        # Re-render diff view to pick up new colours — only if they changed
+        key = _palette_key(name)
+        if key != self._palette_key and self._diff_view is not None:
+            self._diff_view.rerender()
+        self._palette_key = key
         self._status_label.setText(f"Theme: {THEME_LABELS.get(name, name)}")
 
     def mark_theme(self, name: str):
         """Record the initial theme."""
         self._current_theme = name
+        self._palette_key = _palette_key(name)
 
     def _on_settings(self):
         dlg = _SettingsDialog(getattr(self, "_current_theme", "dracula"), self)
@@ -260,39 +313,69 @@ class MainWindow(QMainWindow):
                 self._switch_theme(new_theme)
 
     def _refresh_diff(self):
-        """Re-render the current diff (e.g. after theme change)."""
-        self._diff_view.rerender()
+        """Re-read and re-render the current diff (e.g. after files changed)."""
+        self._diff_cache.clear()
+        if (
+            self._mode == "compare" and self._left and self._right
+            and _is_dir_fast(self._left) and _is_dir_fast(self._right)
+        ):
+            # Re-compare the trees; only rows that changed are touched, so
+            # the selection and scroll position in the list survive
+            diffs = diff_directories_changed_only(self._left, self._right)
+            self._changed_files.load_file_list(diffs, refresh=True)
+        if self._shown is not None:
+            self._show_diff(*self._shown)
+        elif self._diff_view is not None:
+            self._diff_view.rerender()
 
     # =====================================================================
     # File / directory prompts
     # =====================================================================
 
+    def _pick_file(self, title: str) -> str:
+        """Ask for a file, starting where the previous pick was made."""
+        path, _ = QFileDialog.getOpenFileName(self, title, self._last_dir)
+        if path:
+            self._remember_dir(os.path.dirname(path))
+        return path
+
+    def _pick_dir(self, title: str) -> str:
+        path = QFileDialog.getExistingDirectory(self, title, self._last_dir)
+        if path:
+            self._remember_dir(os.path.dirname(path.rstrip("/\\")) or path)
+        return path
+
+    def _remember_dir(self, directory: str):
+        if directory != self._last_dir:
+            self._last_dir = directory
+            self._settings.setValue("last_dir", directory)
+
     def _prompt_compare_files(self):
-        left, _ = QFileDialog.getOpenFileName(self, "Select Left File")
+        left = self._pick_file("Select Left File")
         if not left:
             return
-        right, _ = QFileDialog.getOpenFileName(self, "Select Right File")
+        right = self._pick_file("Select Right File")
         if not right:
             return
         self._compare_files(left, right)
 
     def _prompt_compare_dirs(self):
-        left = QFileDialog.getExistingDirectory(self, "Select Left Directory")
+        left = self._pick_dir("Select Left Directory")
         if not left:
             return
-        right = QFileDialog.getExistingDirectory(self, "Select Right Directory")
+        right = self._pick_dir("Select Right Directory")
         if not right:
             return
         self._compare_dirs(left, right)
 
     def _prompt_merge(self):
-        base, _ = QFileDialog.getOpenFileName(self, "Select Base (ancestor) File")
+        base = self._pick_file("Select Base (ancestor) File")
         if not base:
             return
-        left, _ = QFileDialog.getOpenFileName(self, "Select Left (ours) File")
+        left = self._pick_file("Select Left (ours) File")
         if not left:
             return
-        right, _ = QFileDialog.getOpenFileName(self, "Select Right (theirs) File")
+        right = self._pick_file("Select Right (theirs) File")
         if not right:
             return
         self._do_merge(base, left, right, mode="merge")
@@ -302,52 +385,65 @@ class MainWindow(QMainWindow):
     # =====================================================================
 
     def _compare_files(self, left: str, right: str):
-        self._left = left
-        self._right = right
+        self._cancel_pending_selection()
+        self._abandon_export()
+        self._set_sides(left, right)
         self._mode = "compare"
         self._mode_label.setText("  Mode: Compare")
+        self._ensure_diff_view()
         self._diff_dock.setVisible(True)
         self._diff_dock.raise_()
 
-        self._diff_view.show_files(left, right)
+        self._show_diff(left, right, left, right)
         self._changed_files.clear()
-        self._status_label.setText(f"Comparing: {os.path.basename(left)} ↔ {os.path.basename(right)}")
+        self._status_label.setText(f"Comparing: {self._left_name} ↔ {self._right_name}")
 
     def _compare_dirs(self, left: str, right: str):
-        self._left = left
-        self._right = right
+        self._cancel_pending_selection()
+        self._abandon_export()
+        self._set_sides(left, right)
         self._mode = "compare"
         self._mode_label.setText("  Mode: Compare")
+        diff_view = self._ensure_diff_view()
         self._diff_dock.setVisible(True)
         self._diff_dock.raise_()
 
         self._file_tree.set_root(left)
         diffs = diff_directories_changed_only(left, right)
         self._changed_files.load_file_list(diffs)
-        self._diff_view.clear()
+        diff_view.clear()
+        self._shown = None
         self._status_label.setText(
-            f"Comparing dirs: {os.path.basename(left)} ↔ {os.path.basename(right)}  "
+            f"Comparing dirs: {self._left_name} ↔ {self._right_name}  "
             f"({len(diffs)} changed files)"
         )
 
     def _do_merge(self, base: str, left: str, right: str, mode: str = "merge"):
+        self._abandon_export()
         self._base = base
-        self._left = left
-        self._right = right
+        self._set_sides(left, right)
         self._mode = mode
         self._mode_label.setText(f"  Mode: {mode.title()}")
+        merge_view = self._ensure_merge_view()
         self._merge_dock.setVisible(True)
         self._merge_dock.raise_()
 
-        self._merge_view.load_files(base, left, right, mode=mode)
+        merge_view.load_files(base, left, right, mode=mode)
         self._status_label.setText(
-            f"{mode.title()}: {os.path.basename(left)} ← {os.path.basename(base)} → {os.path.basename(right)}"
+            f"{mode.title()}: {self._left_name} ← {os.path.basename(base)} → {self._right_name}"
         )
 
     # =====================================================================
     # Git commit comparison (launched from CsasziGit)
     # =====================================================================
 
+    def _set_sides(self, left: str, right: str):
+        """Record the two paths being compared (and their display names)."""
+        self._left = left
+        self._right = right
+        self._left_name = os.path.basename(left)
+        self._right_name = os.path.basename(right)
+
     def _auto_load(self):
         """Auto-load based on CLI arguments."""
         if self._repo and self._commit1 and self._commit2:
@@ -355,23 +451,34 @@ class MainWindow(QMainWindow):
         elif self._left and self._right and self._base:
             self._do_merge(self._base, self._left, self._right, mode=self._mode)
         elif self._left and self._right:
-            if os.path.isdir(self._left) and os.path.isdir(self._right):
+            if _is_dir_fast(self._left) and _is_dir_fast(self._right):
                 self._compare_dirs(self._left, self._right)
             else:
                 self._compare_files(self._left, self._right)
 
     @staticmethod
-    def _git_commit_date(repo: str, commit_hash: str) -> str:
-        """Return the commit date as a short string."""
+    def _git_commit_dates(
+        repo: str, commit1: str, commit2: str,
+    ) -> tuple[tuple[int, str], tuple[int, str]] | None:
+        """Return (unix time, short date) for both commits, with one git call."""
         r = subprocess.run(
-            ["git", "log", "-1", "--format=%ci", commit_hash],
-            cwd=repo, capture_output=True, text=True,
-            encoding="utf-8", errors="replace",
+            ["git", "show", "-s", "--format=%ct %ci", commit1, commit2],
+            cwd=repo, capture_output=True,
         )
-        if r.returncode == 0:
-            # "2025-12-01 14:30:00 +0100" → "2025-12-01 14:30"
-            return r.stdout.strip()[:16]
-        return ""
+        if r.returncode != 0:
+            return None
+        dates = []
+        for line in _decode(r.stdout).splitlines():
+            # "1764595800 2025-12-01 14:30:00 +0100" → (1764595800, "2025-12-01 14:30")
+            stamp, _, iso = line.partition(" ")
+            if stamp.isdigit():
+                dates.append((int(stamp), iso[:16]))
+        if len(dates) == 1:
+            # git prints a commit only once when both refs name it
+            return dates[0], dates[0]
+        if len(dates) != 2:
+            return None
+        return dates[0], dates[1]
 
     def _compare_git_commits(self):
         """Export two commits to temp dirs and compare them.
@@ -382,21 +489,49 @@ class MainWindow(QMainWindow):
         - INSERT  → green on the right = content added  in the newer commit
         """
         # Fetch dates before exporting so we can sort chronologically
-        date1 = self._git_commit_date(self._repo, self._commit1)
-        date2 = self._git_commit_date(self._repo, self._commit2)
-
-        # Ensure older commit is on the left (base/old), newer on the right
-        if date1 and date2 and date1 > date2:
-            self._commit1, self._commit2 = self._commit2, self._commit1
-            date1, date2 = date2, date1
-
-        try:
-            left_dir = self._export_commit_tree(self._repo, self._commit1)
-            right_dir = self._export_commit_tree(self._repo, self._commit2)
-            self._temp_dirs.extend([left_dir, right_dir])
-        except Exception as e:
-            QMessageBox.warning(self, "Git Error", str(e))
+        date1 = date2 = ""
+        dates = self._git_commit_dates(self._repo, self._commit1, self._commit2)
+        if dates is not None:
+            (time1, date1), (time2, date2) = dates
+            # Ensure older commit is on the left (base/old), newer on the right.
+            # Compare the timestamps: the short dates are in each committer's
+            # own timezone and do not order reliably.
+            if time1 > time2:
+                self._commit1, self._commit2 = self._commit2, self._commit1
+                date1, date2 = date2, date1
+
+        # Export and compare on a worker thread; the GUI stays responsive
+        job = _ExportJob(self._repo, self._commit1, self._commit2, (date1, date2))
+        job.signals.finished.connect(self._on_export_ready)
+        job.signals.failed.connect(self._on_export_failed)
+        self._export_job = job
+        self._status_label.setText(
+            f"Exporting {self._commit1[:8]} ↔ {self._commit2[:8]}…"
+        )
+        QThreadPool.globalInstance().start(job)
+
+    def _abandon_export(self):
+        """Forget a running commit export; its result would now be stale."""
+        if self._export_job is not None:
+            self._export_job = None
+            self._status_label.setText("Ready")
+
+    def _take_export_job(self) -> _ExportJob | None:
+        """Return the job behind the current signal, unless superseded."""
+        job = self._export_job
+        if job is None or self.sender() is not job.signals:
+            return None
+        self._export_job = None
+        return job
+
+    @pyqtSlot(str, str, object)
+    def _on_export_ready(self, left_dir: str, right_dir: str, diffs: list[FileDiff]):
+        """Both commit trees are exported and compared — show them."""
+        job = self._take_export_job()
+        if job is None:
             return
+        date1, date2 = job.dates
+        self._cancel_pending_selection()
 
         short1 = self._commit1[:8]
         short2 = self._commit2[:8]
@@ -407,17 +542,16 @@ class MainWindow(QMainWindow):
         self.setWindowTitle(f"CsasziCompare — {short1} (older) ↔ {short2} (newer)")
 
         self._file_tree.set_root(left_dir)
-        diffs = diff_directories_changed_only(left_dir, right_dir)
         self._changed_files.load_file_list(diffs)
 
-        self._diff_view.clear()
+        self._ensure_diff_view().clear()
+        self._shown = None
         self._diff_dock.setVisible(True)
         self._diff_dock.raise_()
         self._mode = "compare"
         self._mode_label.setText("  Mode: Compare (Git)")
 
-        self._left = left_dir
-        self._right = right_dir
+        self._set_sides(left_dir, right_dir)
 
         self._status_label.setText(
             f"Comparing commits: {short1} ↔ {short2}  ({len(diffs)} changed files)"
@@ -425,33 +559,92 @@ class MainWindow(QMainWindow):
 
         # Auto-select first changed file
         if diffs:
-            self._on_changed_file_select(diffs[0].rel_path)
+            self._show_changed_file(diffs[0].rel_path, diffs[0].state)
+
+    @pyqtSlot(str)
+    def _on_export_failed(self, message: str):
+        if self._take_export_job() is None:
+            return
+        self._status_label.setText("Ready")
+        QMessageBox.warning(self, "Git Error", message)
+
+    @classmethod
+    def _export_commit_tree(cls, repo: str, commit_hash: str) -> str:
+        """Export the file tree at a given commit to a temporary directory.
+
+        Exports are cached per commit, so reopening the same pair is free.
+        The returned tree is marked in use until passed to
+        :meth:`_release_commit_trees`.
+        """
+        # Resolve refs such as HEAD~1 to the immutable commit hash
+        r = subprocess.run(
+            ["git", "rev-parse", "--verify", f"{commit_hash}^{{commit}}"],
+            cwd=repo, capture_output=True,
+        )
+        if r.returncode != 0:
+            raise RuntimeError(f"git rev-parse failed: {_decode(r.stderr).strip()}")
+        key = (os.path.realpath(repo), _decode(r.stdout).strip())
+        while True:
+            with cls._export_lock:
+                cached = cls._export_cache.get(key)
+                if cached and os.path.isdir(cached):
+                    cls._export_in_use[cached] = cls._export_in_use.get(cached, 0) + 1
+                    return cached
+                pending = cls._export_pending.get(key)
+                if pending is None:
+                    # Reserve the key; the export itself runs unlocked
+                    pending = cls._export_pending[key] = threading.Event()
+                    break
+            # Another job is exporting this commit: wait for it, then look again
+            pending.wait()
+        tmpdir = None
+        try:
+            tmpdir = cls._export_tree(repo, key[1])
+        finally:
+            with cls._export_lock:
+                if tmpdir is not None:
+                    cls._export_cache[key] = tmpdir
+                    cls._export_in_use[tmpdir] = cls._export_in_use.get(tmpdir, 0) + 1
+                del cls._export_pending[key]
+            pending.set()
+        return tmpdir
+
+    @classmethod
+    def _release_commit_trees(cls, *dirs: str | None):
+        """Mark trees from :meth:`_export_commit_tree` as no longer read."""
+        with cls._export_lock:
+            for d in dirs:
+                if d is None:
+                    continue
+                users = cls._export_in_use.get(d, 0) - 1
+                if users > 0:
+                    cls._export_in_use[d] = users
+                else:
+                    cls._export_in_use.pop(d, None)
 
     @staticmethod
-    def _export_commit_tree(repo: str, commit_hash: str) -> str:
-        """Export the file tree at a given commit to a temporary directory."""
-        tmpdir = tempfile.mkdtemp(prefix=f"csaszi_cmp_{commit_hash[:8]}_")
-        # List files at the commit
+    def _export_tree(repo: str, commit: str) -> str:
+        """Write the raw blobs of *commit* into a fresh temp directory.
+
+        ``git archive`` is not used: it applies ``.gitattributes``
+        (export-ignore, export-subst, eol and smudge filters), so its output
+        is not what the commit stores.
+        """
         r = subprocess.run(
-            ["git", "ls-tree", "-r", "--name-only", commit_hash],
-            cwd=repo, capture_output=True, text=True,
-            encoding="utf-8", errors="replace",
+            ["git", "ls-tree", "-r", "-z", commit],
+            cwd=repo, capture_output=True,
         )
         if r.returncode != 0:
-            raise RuntimeError(f"git ls-tree failed: {r.stderr.strip()}")
-
-        for rel_path in r.stdout.strip().splitlines():
-            if not rel_path:
-                continue
-            out_file = os.path.join(tmpdir, rel_path.replace("/", os.sep))
-            os.makedirs(os.path.dirname(out_file), exist_ok=True)
-            r2 = subprocess.run(
-                ["git", "show", f"{commit_hash}:{rel_path}"],
-                cwd=repo, capture_output=True,
-            )
-            if r2.returncode == 0:
-                with open(out_file, "wb") as f:
-                    f.write(r2.stdout)
+            raise RuntimeError(f"git ls-tree failed: {_decode(r.stderr).strip()}")
+        blobs = _tree_blobs(r.stdout)
+        tmpdir = tempfile.mkdtemp(prefix=f"csaszi_cmp_{commit[:12]}_")
+        try:
+            if blobs:
+                _write_blobs(repo, blobs, tmpdir)
+        except BaseException:
+            # Never leave a partial tree behind (disk full, bad path, ...)
+            shutil.rmtree(tmpdir, ignore_errors=True)
+            raise
         return tmpdir
 
     # =====================================================================
@@ -469,12 +662,33 @@ class MainWindow(QMainWindow):
             rel = os.path.basename(abs_path)
         self._on_changed_file_select(rel)
 
-    def _on_changed_file_select(self, rel_path: str):
-        """User clicked a changed file — show its diff."""
+    def _on_changed_file_select(self, rel_path: str, state: FileState | None = None):
+        """User clicked a changed file — show its diff once selection settles."""
+        self._pending_rel = (rel_path, state)
+        self._select_timer.start()
+
+    def _cancel_pending_selection(self):
+        self._select_timer.stop()
+        self._pending_rel = None
+
+    def _flush_selection(self):
+        pending, self._pending_rel = self._pending_rel, None
+        if pending is not None:
+            self._show_changed_file(*pending)
+
+    def _show_changed_file(self, rel_path: str, state: FileState | None = None):
+        """Show the diff of one file of the current comparison.
+
+        A known *state* spares opening the side an added/removed file lacks.
+        """
         if not self._left or not self._right:
             return
-        left_file = os.path.join(self._left, rel_path.replace("/", os.sep))
-        right_file = os.path.join(self._right, rel_path.replace("/", os.sep))
+        left_file = None
+        right_file = None
+        if state != FileState.ADDED:
+            left_file = _rel_to_abs(self._left, rel_path)
+        if state != FileState.REMOVED:
+            right_file = _rel_to_abs(self._right, rel_path)
 
         # Build titles — include commit info when in git compare mode
         # Each title has up to 3 lines: hash, date, filepath
@@ -482,20 +696,37 @@ class MainWindow(QMainWindow):
             left_title = f"{self._git_hash1}\n{self._git_date1}\n{rel_path}"
             right_title = f"{self._git_hash2}\n{self._git_date2}\n{rel_path}"
         else:
-            left_title = f"{os.path.basename(self._left)}\n{rel_path}"
-            right_title = f"{os.path.basename(self._right)}\n{rel_path}"
+            left_title = f"{self._left_name}\n{rel_path}"
+            right_title = f"{self._right_name}\n{rel_path}"
 
-        self._diff_view.show_files(
-            left_file, right_file,
-            left_title=left_title,
-            right_title=right_title,
-        )
+        self._show_diff(left_file, right_file, left_title, right_title)
         self._status_label.setText(f"Viewing: {rel_path}")
 
+    def _show_diff(
+        self, left_file: str | None, right_file: str | None,
+        left_title: str, right_title: str,
+    ):
+        """Show the diff of two files, reusing a cached diff when unchanged.
+
+        ``None`` stands for a side that does not exist.
+        """
+        key = (left_file, right_file, _file_stamp(left_file), _file_stamp(right_file))
+        data = self._diff_cache.get(key)
+        if data is None:
+            data = diff_files(left_file, right_file, context=None)
+            self._diff_cache[key] = data
+            if len(self._diff_cache) > self._DIFF_CACHE_SIZE:
+                self._diff_cache.popitem(last=False)
+        else:
+            self._diff_cache.move_to_end(key)
+        self._shown = (left_file, right_file, left_title, right_title)
+        self._ensure_diff_view().show_diff(data, left_title, right_title)
+
     def _on_merge_saved(self, text: str):
         """User clicked Save Result in the merge view."""
-        path, _ = QFileDialog.getSaveFileName(self, "Save Merged Result")
+        path, _ = QFileDialog.getSaveFileName(self, "Save Merged Result", self._last_dir)
         if path:
+            self._remember_dir(os.path.dirname(path))
             with open(path, "w", encoding="utf-8") as f:
                 f.write(text)
             self._status_label.setText(f"Saved: {path}")
@@ -505,15 +736,229 @@ class MainWindow(QMainWindow):
     # =====================================================================
 
     def closeEvent(self, event):
-        import shutil
-        for d in self._temp_dirs:
-            try:
-                shutil.rmtree(d, ignore_errors=True)
-            except Exception:
-                pass
+        # When the last window closes nobody can reuse the exported trees;
+        # start deleting them now, off the GUI thread, so closing is instant
+        others = [
+            w for w in QApplication.topLevelWidgets()
+            if isinstance(w, MainWindow) and w is not self and w.isVisible()
+        ]
+        if not others:
+            # Only a snapshot is taken under the lock; trees a running
+            # export job still reads stay cached and go at exit instead
+            with self._export_lock:
+                idle = {
+                    k: d for k, d in self._export_cache.items()
+                    if d not in self._export_in_use
+                }
+                for k in idle:
+                    del self._export_cache[k]
+            dirs = list(idle.values())
+            if dirs:
+                _removing.extend(dirs)
+                QThreadPool.globalInstance().start(_RmTreeJob(dirs))
         super().closeEvent(event)
 
 
+_IS_WIN = os.sep == "\\"
+_UTF8_DECODER = codecs.getdecoder("utf-8")
+
+
+def _decode(data: bytes) -> str:
+    """Decode git output as UTF-8, replacing invalid bytes."""
+    return _UTF8_DECODER(data, "replace")[0]
+
+
+def _is_dir_fast(path: str) -> bool:
+    """One stat, no exception: True if *path* is a directory."""
+    try:
+        return stat.S_ISDIR(os.stat(path).st_mode)
+    except (OSError, ValueError):
+        return False
+
+
+def _palette_key(name: str) -> int:
+    """Identity of the palette a theme resolves to (unknown names → Dracula).
+
+    Palettes are read-only, so the same key always means the same colours.
+    """
+    return id(PALETTES.get(name, PALETTES["dracula"]))
+
+
+def _rel_to_abs(root: str, rel: str) -> str:
+    """Join a '/'-separated relative path onto *root*."""
+    if _IS_WIN:
+        return os.path.join(root, *rel.split("/"))
+    return os.path.join(root, rel)
+
+
+def _file_stamp(path: str | None) -> tuple[int, int] | None:
+    """(mtime, size) of *path*, or None if it does not exist."""
+    if path is None:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+_EXPORT_WRITERS = min(8, os.cpu_count() or 1)
+_EXPORT_MAX_PENDING = 64      # blobs read ahead of the writers, at most
+
+
+def _write_blobs(repo: str, blobs: list[tuple[str, bytes]], root: str):
+    """Write the content of every (path, object id) in *blobs* under *root*."""
+    # Stream every blob through one git cat-file --batch instead of
+    # spawning a git show per file.  The object ids come from a temp
+    # file, so git never blocks on a stdin pipe while we read stdout.
+    with tempfile.TemporaryFile() as ids:
+        ids.write(b"".join(oid + b"\n" for _, oid in blobs))
+        ids.seek(0)
+        p = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=repo, stdin=ids, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        )
+    read_error = None
+    try:
+        # Blobs are read in order here, while the file writes go to a
+        # small pool so they overlap with git producing data
+        with ThreadPoolExecutor(max_workers=_EXPORT_WRITERS) as pool:
+            made: set[str] = set()
+            pending: deque = deque()
+            for rel, oid in blobs:
+                data = _read_blob(p.stdout, oid)
+                out_file = _export_path(root, rel, made)
+                if out_file is None:
+                    continue
+                pending.append(pool.submit(_write_file, out_file, data))
+                if len(pending) >= _EXPORT_MAX_PENDING:
+                    pending.popleft().result()
+            for fut in pending:
+                fut.result()
+    except ValueError as e:
+        read_error = e
+    finally:
+        p.stdout.close()
+        err = p.stderr.read()
+        p.wait()
+    if read_error is not None and p.returncode == 0:
+        raise RuntimeError(f"git cat-file output unreadable: {read_error}")
+    if p.returncode != 0:
+        raise RuntimeError(
+            f"git cat-file failed: {_decode(err).strip()}"
+        )
+
+
+def _tree_blobs(listing: bytes) -> list[tuple[str, bytes]]:
+    """Parse ``git ls-tree -r -z`` output into (path, object id) pairs.
+
+    Only blobs are kept; submodule entries have no content in this repo.
+    Symlinks are blobs holding the link target, so they are exported as
+    plain files with that text, as ``git show`` did.
+    """
+    blobs = []
+    for entry in listing.split(b"\0"):
+        meta, _, name = entry.partition(b"\t")
+        fields = meta.split()
+        if len(fields) == 3 and fields[1] == b"blob":
+            blobs.append((name.decode("utf-8", "surrogateescape"), fields[2]))
+    return blobs
+
+
+def _read_blob(stream, oid: bytes) -> bytes:
+    """Read the next ``git cat-file --batch`` record, which must be *oid*."""
+    header = stream.readline().split()
+    if len(header) != 3 or header[0] != oid or header[1] != b"blob":
+        raise ValueError(f"unexpected record for {_decode(oid)}: {header!r}")
+    size = int(header[2])
+    data = stream.read(size)
+    if len(data) != size or stream.read(1) != b"\n":
+        raise ValueError(f"truncated blob {_decode(oid)}")
+    return data
+
+
+def _export_path(root: str, rel: str, made: set[str]) -> str | None:
+    """Destination of tree entry *rel* under *root*, or None if unsafe.
+
+    Parent directories are created here, once each (tracked in *made*).
+    """
+    parts = rel.split("/")
+    if rel.startswith("/") or ".." in parts:
+        return None
+    out_file = os.path.join(root, *parts)
+    parent = os.path.dirname(out_file)
+    if parent not in made:
+        os.makedirs(parent, exist_ok=True)
+        made.add(parent)
+    return out_file
+
+
+def _write_file(path: str, data: bytes):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+class _ExportSignals(QObject):
+    finished = pyqtSignal(str, str, object)   # left dir, right dir, diffs
+    failed = pyqtSignal(str)                  # error message
+
+
+class _ExportJob(QRunnable):
+    """Export two commits and diff the trees on a pool thread."""
+
+    def __init__(
+        self, repo: str, commit1: str, commit2: str, dates: tuple[str, str],
+    ):
+        super().__init__()
+        self.signals = _ExportSignals()
+        self.dates = dates
+        self._repo = repo
+        self._commit1 = commit1
+        self._commit2 = commit2
+
+    def run(self):
+        left_dir = right_dir = None
+        try:
+            left_dir = MainWindow._export_commit_tree(self._repo, self._commit1)
+            right_dir = MainWindow._export_commit_tree(self._repo, self._commit2)
+            diffs = diff_directories_changed_only(left_dir, right_dir)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        finally:
+            MainWindow._release_commit_trees(left_dir, right_dir)
+        self.signals.finished.emit(left_dir, right_dir, diffs)
+
+
+class _RmTreeJob(QRunnable):
+    """Delete directory trees on a pool thread."""
+
+    def __init__(self, dirs: list[str]):
+        super().__init__()
+        self._dirs = dirs
+
+    def run(self):
+        for d in self._dirs:
+            shutil.rmtree(d, ignore_errors=True)
+
+
+# Trees handed to an _RmTreeJob; checked again at exit in case it was cut short
+_removing: list[str] = []
+
+
+def _cleanup_exports():
+    """Remove every exported commit tree when the process exits."""
+    # Let running exports / removals finish before touching their trees
+    QThreadPool.globalInstance().waitForDone()
+    for d in [*MainWindow._export_cache.values(), *_removing]:
+        shutil.rmtree(d, ignore_errors=True)
+    MainWindow._export_cache.clear()
+    _removing.clear()
+
+
+atexit.register(_cleanup_exports)
+
+
 # =========================================================================
 # Settings dialog
 # =========================================================================
@@ -540,7 +985,12 @@ class _SettingsDialog(QDialog):
         idx = THEME_NAMES.index(current_theme) if current_theme in THEME_NAMES else 0
         self._combo.setCurrentIndex(idx)
 
-        # Live preview
+        # Live preview, applied once the selection rests for a moment so
+        # scrolling through the combo does not restyle the app per step
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(200)
+        self._preview_timer.timeout.connect(self._apply_preview)
         self._combo.currentIndexChanged.connect(self._on_preview)
 
         lay.addWidget(self._combo)
@@ -561,16 +1011,34 @@ class _SettingsDialog(QDialog):
         lay.addLayout(btn_row)
 
         self._original_theme = current_theme
+        self._applied_key = _palette_key(current_theme)
 
     def selected_theme(self) -> str:
         return self._combo.currentData()
 
     def _on_preview(self):
+        self._preview_timer.start()
+
+    def _apply_preview(self):
         name = self._combo.currentData()
         if name:
+            self._apply(name)
+
+    def _apply(self, name: str):
+        key = _palette_key(name)
+        if key != self._applied_key:
             apply_theme(QApplication.instance(), name)
+            self._applied_key = key
 
     def reject(self):
         # Revert to original theme on cancel
-        apply_theme(QApplication.instance(), self._original_theme)
+        self._apply(self._original_theme)
         super().reject()
+
+    def done(self, result):
+        # Settle a pending preview so the app shows what was chosen
+        if self._preview_timer.isActive():
+            self._preview_timer.stop()
+            if result == QDialog.DialogCode.Accepted:
+                self._apply_preview()
+        super().done(result)
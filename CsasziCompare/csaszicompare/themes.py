@@ -5,6 +5,9 @@ Adapted from CsasziGit themes with additional diff-specific colours
 for the comparison views (faint add/del backgrounds, inline char highlights).
 """
 
+from types import MappingProxyType
+from typing import Mapping
+
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QPalette, QColor
 from PyQt6.QtCore import Qt
@@ -117,186 +120,201 @@ PALETTES = {
     },
 }
 
+# Palettes are read-only: the stylesheet/QPalette caches and the per-palette
+# caches in the widgets rely on a palette never changing after import
+PALETTES = {name: MappingProxyType(p) for name, p in PALETTES.items()}
+
 THEME_NAMES = list(PALETTES.keys())
 THEME_LABELS = {"dracula": "Dracula", "dark": "Dark", "bright": "Bright"}
 
-_current_palette: dict = PALETTES["dracula"]
+_current_palette: Mapping[str, str] = PALETTES["dracula"]
+_current_qcolors: Mapping[str, QColor] | None = None
+_current_name: str | None = None   # theme last applied to the application
 
 
-def palette() -> dict:
-    """Return the active colour palette dict."""
+def palette() -> Mapping[str, str]:
+    """Return the active colour palette (read-only)."""
     return _current_palette
 
 
+def palette_qcolors() -> Mapping[str, QColor]:
+    """Return the active palette as parsed ``QColor`` objects (read-only)."""
+    global _current_qcolors
+    if _current_qcolors is None:
+        _current_qcolors = _qcolors_for(_current_palette)
+    return _current_qcolors
+
+
 # ── QSS ──────────────────────────────────────────────────────────────────────
 
-def _build_qss(p: dict) -> str:
-    return f"""
+# Parsed once at import; rendering is a single format_map over the palette.
+# Placeholders are palette keys; literal braces are doubled.
+_QSS_TEMPLATE = """
 /* ── Global ─────────────────────────────────────────── */
 QWidget {{
-    background-color: {p["bg"]};
-    color: {p["fg"]};
+    background-color: {bg};
+    color: {fg};
     font-family: "Segoe UI", "Consolas", sans-serif;
     font-size: 13px;
-    selection-background-color: {p["selection"]};
-    selection-color: {p["fg"]};
+    selection-background-color: {selection};
+    selection-color: {fg};
 }}
 QMenuBar {{
-    background-color: {p["bg_alt"]};
-    color: {p["fg"]};
-    border-bottom: 1px solid {p["border"]};
+    background-color: {bg_alt};
+    color: {fg};
+    border-bottom: 1px solid {border};
     padding: 2px;
 }}
 QMenuBar::item:selected {{
-    background-color: {p["current"]};
+    background-color: {current};
     border-radius: 3px;
 }}
 QMenu {{
-    background-color: {p["surface"]};
-    color: {p["fg"]};
-    border: 1px solid {p["border"]};
+    background-color: {surface};
+    color: {fg};
+    border: 1px solid {border};
     padding: 4px 0;
 }}
 QMenu::item:selected {{
-    background-color: {p["accent"]};
-    color: {p["bg"]};
+    background-color: {accent};
+    color: {bg};
     border-radius: 2px;
 }}
 QMenu::separator {{
     height: 1px;
-    background: {p["border"]};
+    background: {border};
     margin: 4px 8px;
 }}
 QToolBar {{
-    background-color: {p["bg_alt"]};
-    border-bottom: 1px solid {p["border"]};
+    background-color: {bg_alt};
+    border-bottom: 1px solid {border};
     spacing: 4px;
     padding: 3px;
 }}
 QToolBar::separator {{
     width: 1px;
-    background: {p["border"]};
+    background: {border};
     margin: 4px 2px;
 }}
 QToolButton {{
     background-color: transparent;
-    color: {p["fg"]};
+    color: {fg};
     border: 1px solid transparent;
     border-radius: 4px;
     padding: 4px 8px;
     font-size: 13px;
 }}
 QToolButton:hover {{
-    background-color: {p["button_hover"]};
-    border-color: {p["border"]};
+    background-color: {button_hover};
+    border-color: {border};
 }}
 QToolButton:pressed {{
-    background-color: {p["button_pressed"]};
+    background-color: {button_pressed};
 }}
 QPushButton {{
-    background-color: {p["button"]};
-    color: {p["fg"]};
-    border: 1px solid {p["border"]};
+    background-color: {button};
+    color: {fg};
+    border: 1px solid {border};
     border-radius: 4px;
     padding: 5px 14px;
     min-height: 22px;
 }}
 QPushButton:hover {{
-    background-color: {p["button_hover"]};
+    background-color: {button_hover};
 }}
 QPushButton:pressed {{
-    background-color: {p["button_pressed"]};
+    background-color: {button_pressed};
 }}
 QPushButton:disabled {{
-    color: {p["fg_dim"]};
-    background-color: {p["bg_alt"]};
+    color: {fg_dim};
+    background-color: {bg_alt};
 }}
 QPushButton[accent="true"] {{
-    background-color: {p["accent"]};
-    color: {p["bg"]};
-    border-color: {p["accent"]};
+    background-color: {accent};
+    color: {bg};
+    border-color: {accent};
     font-weight: bold;
 }}
 QLineEdit, QTextEdit, QPlainTextEdit {{
-    background-color: {p["surface"]};
-    color: {p["fg"]};
-    border: 1px solid {p["border"]};
+    background-color: {surface};
+    color: {fg};
+    border: 1px solid {border};
     border-radius: 4px;
     padding: 4px 6px;
 }}
 QLineEdit:focus, QTextEdit:focus, QPlainTextEdit:focus {{
-    border-color: {p["accent"]};
+    border-color: {accent};
 }}
 QComboBox {{
-    background-color: {p["surface"]};
-    color: {p["fg"]};
-    border: 1px solid {p["border"]};
+    background-color: {surface};
+    color: {fg};
+    border: 1px solid {border};
     border-radius: 4px;
     padding: 4px 8px;
     min-height: 22px;
 }}
 QComboBox::drop-down {{ border: none; width: 20px; }}
 QComboBox QAbstractItemView {{
-    background-color: {p["surface"]};
-    color: {p["fg"]};
-    border: 1px solid {p["border"]};
-    selection-background-color: {p["accent"]};
-    selection-color: {p["bg"]};
+    background-color: {surface};
+    color: {fg};
+    border: 1px solid {border};
+    selection-background-color: {accent};
+    selection-color: {bg};
 }}
 QTreeWidget, QTreeView, QTableWidget, QTableView, QListWidget, QListView {{
-    background-color: {p["bg_alt"]};
-    alternate-background-color: {p["surface"]};
-    color: {p["fg"]};
-    border: 1px solid {p["border"]};
+    background-color: {bg_alt};
+    alternate-background-color: {surface};
+    color: {fg};
+    border: 1px solid {border};
     border-radius: 4px;
     outline: none;
 }}
-QTreeWidget::item, QListWidget::item {{
+QTreeWidget::item, QListWidget::item, QListView::item {{
     padding: 3px 4px;
 }}
-QTreeWidget::item:hover, QListWidget::item:hover {{
-    background-color: {p["current"]};
+QTreeWidget::item:hover, QListWidget::item:hover, QListView::item:hover {{
+    background-color: {current};
 }}
-QTreeWidget::item:selected, QListWidget::item:selected {{
-    background-color: {p["selection"]};
-    color: {p["fg"]};
+QTreeWidget::item:selected, QListWidget::item:selected, QListView::item:selected {{
+    background-color: {selection};
+    color: {fg};
 }}
 QTreeWidget::branch {{ background: transparent; }}
 QHeaderView::section {{
-    background-color: {p["bg_alt"]};
-    color: {p["fg"]};
+    background-color: {bg_alt};
+    color: {fg};
     border: none;
-    border-right: 1px solid {p["border"]};
-    border-bottom: 1px solid {p["border"]};
+    border-right: 1px solid {border};
+    border-bottom: 1px solid {border};
     padding: 4px 6px;
     font-weight: bold;
 }}
 QScrollBar:vertical {{
-    background: {p["bg_alt"]}; width: 12px; border: none;
+    background: {bg_alt}; width: 12px; border: none;
 }}
 QScrollBar::handle:vertical {{
-    background: {p["scrollbar"]}; min-height: 30px;
+    background: {scrollbar}; min-height: 30px;
     border-radius: 4px; margin: 2px;
 }}
-QScrollBar::handle:vertical:hover {{ background: {p["scrollbar_hover"]}; }}
+QScrollBar::handle:vertical:hover {{ background: {scrollbar_hover}; }}
 QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{ height: 0; }}
 QScrollBar:horizontal {{
-    background: {p["bg_alt"]}; height: 12px; border: none;
+    background: {bg_alt}; height: 12px; border: none;
 }}
 QScrollBar::handle:horizontal {{
-    background: {p["scrollbar"]}; min-width: 30px;
+    background: {scrollbar}; min-width: 30px;
     border-radius: 4px; margin: 2px;
 }}
-QScrollBar::handle:horizontal:hover {{ background: {p["scrollbar_hover"]}; }}
+QScrollBar::handle:horizontal:hover {{ background: {scrollbar_hover}; }}
 QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {{ width: 0; }}
 QTabWidget::pane {{
-    border: 1px solid {p["border"]};
+    border: 1px solid {border};
     border-top: none;
 }}
 QTabBar::tab {{
-    background-color: {p["tab_inactive"]};
-    color: {p["fg_dim"]};
-    border: 1px solid {p["border"]};
+    background-color: {tab_inactive};
+    color: {fg_dim};
+    border: 1px solid {border};
     border-bottom: none;
     padding: 6px 16px;
     margin-right: 2px;
@@ -304,62 +322,107 @@ QTabBar::tab {{
     border-top-right-radius: 4px;
 }}
 QTabBar::tab:selected {{
-    background-color: {p["tab_active"]};
-    color: {p["fg"]};
+    background-color: {tab_active};
+    color: {fg};
     font-weight: bold;
 }}
 QTabBar::tab:hover:!selected {{
-    background-color: {p["current"]};
-    color: {p["fg"]};
+    background-color: {current};
+    color: {fg};
 }}
-QSplitter::handle {{ background-color: {p["border"]}; }}
+QSplitter::handle {{ background-color: {border}; }}
 QSplitter::handle:horizontal {{ width: 2px; }}
 QSplitter::handle:vertical {{ height: 2px; }}
 QStatusBar {{
-    background-color: {p["bg_alt"]};
-    color: {p["fg_dim"]};
-    border-top: 1px solid {p["border"]};
+    background-color: {bg_alt};
+    color: {fg_dim};
+    border-top: 1px solid {border};
     padding: 2px;
 }}
-QDockWidget {{ color: {p["fg"]}; }}
+QDockWidget {{ color: {fg}; }}
 QDockWidget::title {{
-    background-color: {p["bg_alt"]};
-    border: 1px solid {p["border"]};
+    background-color: {bg_alt};
+    border: 1px solid {border};
     padding: 5px;
     text-align: left;
     font-weight: bold;
 }}
 QToolTip {{
-    background-color: {p["surface"]};
-    color: {p["fg"]};
-    border: 1px solid {p["border"]};
+    background-color: {surface};
+    color: {fg};
+    border: 1px solid {border};
     padding: 4px;
     border-radius: 3px;
 }}
-QCheckBox, QRadioButton {{ color: {p["fg"]}; spacing: 6px; }}
-QDialog {{ background-color: {p["bg"]}; }}
-QLabel[accent="true"] {{ color: {p["accent"]}; font-weight: bold; }}
+QCheckBox, QRadioButton {{ color: {fg}; spacing: 6px; }}
+QDialog {{ background-color: {bg}; }}
+QLabel[accent="true"] {{ color: {accent}; font-weight: bold; }}
 """
 
 
+def _build_qss(p: Mapping[str, str]) -> str:
+    return _QSS_TEMPLATE.format_map(p)
+
+
+# Rendered per theme on first use; palettes are fixed, so these never go stale
+_QSS_CACHE: dict[str, str] = {}
+_PAL_CACHE: dict[str, QPalette] = {}
+_QCOLOR_CACHE: dict[int, Mapping[str, QColor]] = {}
+
+
+def _qcolors_for(p: Mapping[str, str]) -> Mapping[str, QColor]:
+    """Parse every ``#RRGGBB`` entry of *p* once and keep the result."""
+    qcolors = _QCOLOR_CACHE.get(id(p))
+    if qcolors is None:
+        qcolors = _QCOLOR_CACHE[id(p)] = MappingProxyType({
+            k: QColor(v) for k, v in p.items() if v.startswith("#")
+        })
+    return qcolors
+
+
 def apply_theme(app: QApplication, name: str = "dracula"):
     """Apply the named theme to the whole application."""
-    global _current_palette
-    p = PALETTES.get(name, PALETTES["dracula"])
+    global _current_palette, _current_qcolors, _current_name
+    if name not in PALETTES:
+        name = "dracula"
+    if name == _current_name:
+        # Re-setting an identical stylesheet still restyles every widget
+        return
+    _current_name = name
+    p = PALETTES[name]
     _current_palette = p
-    app.setStyleSheet(_build_qss(p))
+    _current_qcolors = _qcolors_for(p)
 
-    pal = QPalette()
-    pal.setColor(QPalette.ColorRole.Window, QColor(p["bg"]))
-    pal.setColor(QPalette.ColorRole.WindowText, QColor(p["fg"]))
-    pal.setColor(QPalette.ColorRole.Base, QColor(p["bg_alt"]))
-    pal.setColor(QPalette.ColorRole.AlternateBase, QColor(p["surface"]))
-    pal.setColor(QPalette.ColorRole.Text, QColor(p["fg"]))
-    pal.setColor(QPalette.ColorRole.Button, QColor(p["button"]))
-    pal.setColor(QPalette.ColorRole.ButtonText, QColor(p["fg"]))
-    pal.setColor(QPalette.ColorRole.Highlight, QColor(p["accent"]))
-    pal.setColor(QPalette.ColorRole.HighlightedText, QColor(p["bg"]))
-    pal.setColor(QPalette.ColorRole.Link, QColor(p["link"]))
-    pal.setColor(QPalette.ColorRole.ToolTipBase, QColor(p["surface"]))
-    pal.setColor(QPalette.ColorRole.ToolTipText, QColor(p["fg"]))
+    qss = _QSS_CACHE.get(name)
+    if qss is None:
+        qss = _QSS_CACHE[name] = _build_qss(p)
+    app.setStyleSheet(qss)
+
+    pal = _PAL_CACHE.get(name)
+    if pal is None:
+        pal = _PAL_CACHE[name] = _build_palette(_current_qcolors)
     app.setPalette(pal)
+
+
+# QPalette role → palette key
+_ROLE_KEYS = (
+    (QPalette.ColorRole.Window,          "bg"),
+    (QPalette.ColorRole.WindowText,      "fg"),
+    (QPalette.ColorRole.Base,            "bg_alt"),
+    (QPalette.ColorRole.AlternateBase,   "surface"),
+    (QPalette.ColorRole.Text,            "fg"),
+    (QPalette.ColorRole.Button,          "button"),
+    (QPalette.ColorRole.ButtonText,      "fg"),
+    (QPalette.ColorRole.Highlight,       "accent"),
+    (QPalette.ColorRole.HighlightedText, "bg"),
+    (QPalette.ColorRole.Link,            "link"),
+    (QPalette.ColorRole.ToolTipBase,     "surface"),
+    (QPalette.ColorRole.ToolTipText,     "fg"),
+)
+
+
+def _build_palette(c: Mapping[str, QColor]) -> QPalette:
+    pal = QPalette()
+    for role, key in _ROLE_KEYS:
+        pal.setColor(role, c[key])
+    return pal
@@ -1,26 +1,34 @@
 """
 Changed-files panel — shows the list of files that differ between two
 sides (directories or commits).  Clicking a file emits ``file_selected``
-with the relative path.
+with the relative path and its ``FileState``.
 """
 
 import os
+import sys
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QListWidget, QListWidgetItem, QLabel,
-    QAbstractItemView,
+    QWidget, QVBoxLayout, QListView, QLabel, QAbstractItemView,
+)
+from PyQt6.QtGui import QFont, QColor, QIcon, QPixmap, QPainter, QPen
+from PyQt6.QtCore import (
+    Qt, QSize, QPointF, pyqtSignal, QAbstractListModel, QModelIndex,
 )
-from PyQt6.QtGui import QFont, QColor, QIcon
-from PyQt6.QtCore import Qt, pyqtSignal
 
 from csaszicompare.diff_engine import FileDiff, FileState, diff_directories_changed_only
-from csaszicompare.themes import palette
+from csaszicompare.themes import palette_qcolors
 
 
-_STATE_ICON = {
-    FileState.MODIFIED: "✏️",
-    FileState.ADDED:    "➕",
-    FileState.REMOVED:  "➖",
-}
+_ROLE_PATH = Qt.ItemDataRole.UserRole
+_ROLE_STATE = Qt.ItemDataRole.UserRole + 1
+
+# Roles resolved once; data() is called per painted row per role
+_DISPLAY = Qt.ItemDataRole.DisplayRole
+_DECORATION = Qt.ItemDataRole.DecorationRole
+_FOREGROUND = Qt.ItemDataRole.ForegroundRole
+_TOOLTIP = Qt.ItemDataRole.ToolTipRole
+_SERVED_ROLES = frozenset(
+    (_DISPLAY, _DECORATION, _FOREGROUND, _TOOLTIP, _ROLE_PATH, _ROLE_STATE)
+)
 
 _STATE_LABEL = {
     FileState.MODIFIED: "Modified",
@@ -28,11 +36,156 @@ _STATE_LABEL = {
     FileState.REMOVED:  "Removed",
 }
 
+# Per-state tooltip prefixes, so a tooltip is a single concatenation
+_STATE_TOOLTIP_PREFIX = {s: f"{label} — " for s, label in _STATE_LABEL.items()}
+
+_ICON_SIZE = 12
+
+
+def _state_icon(state: FileState, colour: QColor) -> QIcon:
+    """Paint the small marker shown in front of a changed file."""
+    pm = QPixmap(_ICON_SIZE, _ICON_SIZE)
+    pm.fill(Qt.GlobalColor.transparent)
+    qp = QPainter(pm)
+    qp.setRenderHint(QPainter.RenderHint.Antialiasing)
+    qp.setPen(QPen(colour, 2))
+    mid = _ICON_SIZE / 2
+    if state == FileState.MODIFIED:
+        qp.setBrush(colour)
+        qp.drawEllipse(QPointF(mid, mid), 3, 3)
+    else:
+        qp.drawLine(QPointF(2, mid), QPointF(_ICON_SIZE - 2, mid))
+        if state == FileState.ADDED:
+            qp.drawLine(QPointF(mid, 2), QPointF(mid, _ICON_SIZE - 2))
+    qp.end()
+    return QIcon(pm)
+
+
+def _runs(rows) -> list[tuple[int, int]]:
+    """Group ascending row numbers into ``(first, last)`` contiguous runs."""
+    runs: list[tuple[int, int]] = []
+    for r in rows:
+        if runs and runs[-1][1] == r - 1:
+            runs[-1] = (runs[-1][0], r)
+        else:
+            runs.append((r, r))
+    return runs
+
+
+class _ChangedFilesModel(QAbstractListModel):
+    """List model over a ``list[FileDiff]``, stored as parallel columns.
+
+    Rows are not materialised as items; label, colour and tooltip are
+    produced on demand for the rows the view actually paints.  The state
+    markers are painted once per palette and shared by every row.
+    """
+
+    # State icons per QColor mapping (one per palette, so id() is stable)
+    _icon_cache: dict[int, dict[FileState, QIcon]] = {}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._paths: list[str] = []
+        self._states: list[FileState] = []
+        self._colours: dict[FileState, QColor] = {}
+        self._icons: dict[FileState, QIcon] = {}
+
+    def set_rows(self, rows: list[FileDiff], refresh: bool = False):
+        """Show *rows*; with *refresh*, update the current rows in place."""
+        c = palette_qcolors()
+        colours = {
+            FileState.MODIFIED: c["yellow"],
+            FileState.ADDED:    c["green"],
+            FileState.REMOVED:  c["red"],
+        }
+        icons = self._icon_cache.get(id(c))
+        if icons is None:
+            icons = self._icon_cache[id(c)] = {
+                s: _state_icon(s, colour) for s, colour in colours.items()
+            }
+        paths = [d.rel_path for d in rows]
+        states = [d.state for d in rows]
+        if refresh and icons is self._icons and self._apply_delta(paths, states):
+            return
+        self.beginResetModel()
+        self._paths = paths
+        self._states = states
+        self._colours = colours
+        self._icons = icons
+        self.endResetModel()
+
+    # More separate insert/remove runs than this and a reset is cheaper
+    _MAX_DELTA_RUNS = 32
+
+    def _apply_delta(self, paths: list[str], states: list[FileState]) -> bool:
+        """Turn the current rows into *paths*/*states* in place.
+
+        Only the rows that went away, appeared or changed state are
+        touched, so a refresh after editing a file or two keeps the
+        selection and scroll position.  Returns False, having changed
+        nothing, when the rows are not in a common order or the delta is
+        too scattered; the caller then resets the model instead.
+        """
+        old = self._paths
+        if not old or not paths:
+            return False
+        new_set = set(paths)
+        old_set = set(old)
+        if [p for p in old if p in new_set] != [p for p in paths if p in old_set]:
+            return False
+
+        removed = _runs(i for i, p in enumerate(old) if p not in new_set)
+        added = _runs(i for i, p in enumerate(paths) if p not in old_set)
+        if len(removed) + len(added) > self._MAX_DELTA_RUNS:
+            return False
+
+        root = QModelIndex()
+        # Back to front, so earlier runs keep their row numbers
+        for first, last in reversed(removed):
+            self.beginRemoveRows(root, first, last)
+            del self._paths[first:last + 1]
+            del self._states[first:last + 1]
+            self.endRemoveRows()
+        # Front to back at final positions: everything before a run is
+        # already in its final place when the run goes in
+        for first, last in added:
+            self.beginInsertRows(root, first, last)
+            self._paths[first:first] = paths[first:last + 1]
+            self._states[first:first] = states[first:last + 1]
+            self.endInsertRows()
+
+        changed = [i for i, (a, b) in enumerate(zip(self._states, states)) if a != b]
+        self._paths = paths
+        self._states = states
+        if changed:
+            self.dataChanged.emit(self.index(changed[0]), self.index(changed[-1]))
+        return True
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._paths)
+
+    def data(self, index, role=_DISPLAY):
+        # The delegate asks for a dozen roles per painted row; most of them
+        # are not served here, so turn those away before touching the row
+        if role not in _SERVED_ROLES or not index.isValid():
+            return None
+        row = index.row()
+        if role == _DISPLAY or role == _ROLE_PATH:
+            return self._paths[row]
+        if role == _DECORATION:
+            return self._icons.get(self._states[row])
+        if role == _FOREGROUND:
+            return self._colours.get(self._states[row])
+        if role == _ROLE_STATE:
+            return self._states[row]
+        # _TOOLTIP
+        return _STATE_TOOLTIP_PREFIX.get(self._states[row], "") + self._paths[row]
+
 
 class ChangedFilesPanel(QWidget):
     """Lists files that differ between two sides."""
 
-    file_selected = pyqtSignal(str)   # relative path
+    file_selected = pyqtSignal(str, object)   # relative path, FileState
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -46,61 +199,78 @@ class ChangedFilesPanel(QWidget):
         self._header.setContentsMargins(4, 4, 4, 2)
         lay.addWidget(self._header)
 
-        self._list = QListWidget()
+        self._model = _ChangedFilesModel(self)
+        self._list = QListView()
+        self._list.setModel(self._model)
         self._list.setFont(QFont("Consolas", 10))
         self._list.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
-        self._list.currentItemChanged.connect(self._on_item_changed)
+        self._list.setIconSize(QSize(_ICON_SIZE, _ICON_SIZE))
+        self._list.setUniformItemSizes(True)
+        # Lay very long lists out in slices so a reset never stalls the UI
+        self._list.setLayoutMode(QListView.LayoutMode.Batched)
+        self._list.setBatchSize(500)
+        # currentChanged (not clicked) so keyboard navigation also selects;
+        # a model reset clears the current index without emitting it
+        self._list.selectionModel().currentChanged.connect(self._on_item_changed)
         lay.addWidget(self._list)
 
         self._diffs: list[FileDiff] = []
 
     # ── public ────────────────────────────────────────────────────────────
 
-    def load_directories(self, left_dir: str, right_dir: str):
+    # Pass refresh=True when reloading the comparison already shown: rows
+    # are then updated in place and the selection survives.  A new
+    # comparison always starts with nothing selected.
+
+    def load_directories(self, left_dir: str, right_dir: str, refresh: bool = False):
         """Compare two directories and populate the list."""
         self._diffs = diff_directories_changed_only(left_dir, right_dir)
-        self._populate()
+        self._populate(refresh)
 
-    def load_file_list(self, diffs: list[FileDiff]):
+    def load_file_list(self, diffs: list[FileDiff], refresh: bool = False):
         """Load a pre-computed list of changed files."""
         self._diffs = [d for d in diffs if d.state != FileState.SAME]
-        self._populate()
+        self._populate(refresh)
 
-    def load_paths(self, paths: list[tuple[str, FileState]]):
+    def load_paths(self, paths: list[tuple[str, FileState]], refresh: bool = False):
         """Load from a list of (rel_path, state) tuples."""
-        self._diffs = [FileDiff(p, s) for p, s in paths]
-        self._populate()
+        intern = sys.intern
+        self._diffs = [FileDiff(intern(p), s) for p, s in paths]
+        self._populate(refresh)
 
     def clear(self):
         self._diffs = []
-        self._list.clear()
+        self._populate()
         self._header.setText("Changed Files")
 
     # ── private ───────────────────────────────────────────────────────────
 
-    def _populate(self):
-        self._list.clear()
-        p = palette()
-        colour_map = {
-            FileState.MODIFIED: QColor(p["yellow"]),
-            FileState.ADDED:    QColor(p["green"]),
-            FileState.REMOVED:  QColor(p["red"]),
-        }
-        for fd in self._diffs:
-            icon = _STATE_ICON.get(fd.state, "")
-            label = f"{icon}  {fd.rel_path}"
-            item = QListWidgetItem(label)
-            item.setData(Qt.ItemDataRole.UserRole, fd.rel_path)
-            item.setToolTip(f"{_STATE_LABEL.get(fd.state, '')} — {fd.rel_path}")
-            c = colour_map.get(fd.state)
-            if c:
-                item.setForeground(c)
-            self._list.addItem(item)
-
-        self._header.setText(f"Changed Files ({len(self._diffs)})")
+    def _populate(self, refresh: bool = False):
+        # One model reset (or one in-place delta), however many rows; hold
+        # repaints so the list and the header count update together
+        before = self._current_row()
+        self.setUpdatesEnabled(False)
+        blocked = self.blockSignals(True)
+        try:
+            self._model.set_rows(self._diffs, refresh)
+            self._header.setText(f"Changed Files ({len(self._diffs)})")
+        finally:
+            self.blockSignals(blocked)
+            self.setUpdatesEnabled(True)
+        # Removing the current row moves the current index to a neighbour;
+        # that selection was made with our signals blocked, so report it now
+        after = self._current_row()
+        if after is not None and after != before:
+            self.file_selected.emit(*after)
+
+    def _current_row(self) -> tuple[str, FileState] | None:
+        current = self._list.currentIndex()
+        if not current.isValid():
+            return None
+        return current.data(_ROLE_PATH), current.data(_ROLE_STATE)
 
     def _on_item_changed(self, current, previous):
-        if current:
-            rel = current.data(Qt.ItemDataRole.UserRole)
+        if current.isValid():
+            rel = current.data(_ROLE_PATH)
             if rel:
-                self.file_selected.emit(rel)
+                self.file_selected.emit(rel, current.data(_ROLE_STATE))
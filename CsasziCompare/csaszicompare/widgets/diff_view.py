@@ -11,20 +11,147 @@ Shows left and right file content side-by-side with:
 
 from __future__ import annotations
 
+import re
+from dataclasses import dataclass
+
 from PyQt6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QPlainTextEdit, QLabel,
     QScrollBar, QPushButton, QSplitter, QTextEdit, QCheckBox,
 )
 from PyQt6.QtGui import (
     QFont, QColor, QTextCharFormat, QTextCursor, QSyntaxHighlighter,
-    QTextDocument, QPainter, QPalette, QTextFormat, QTextBlockUserData,
+    QTextDocument, QPainter, QPalette, QTextFormat, QTextBlockFormat,
 )
-from PyQt6.QtCore import Qt, QRect, QSize, pyqtSignal, QTimer
+from PyQt6.QtCore import Qt, QEvent, QRect, QSize, pyqtSignal, QTimer
 
 from csaszicompare.diff_engine import (
     DiffLine, LineTag, CharSpan, diff_lines, diff_files,
 )
-from csaszicompare.themes import palette
+from csaszicompare.themes import palette_qcolors
+
+# Stand-in text for a folded run of equal lines
+_HUNK_TEXT = "─── ⋯ ───"
+
+# Character-span tags painted with the stronger highlight background
+_HIGHLIGHT_TAGS = frozenset(("delete", "insert", "replace"))
+
+
+def _utf16_len(text: str) -> int:
+    """Length of *text* in UTF-16 code units (Qt document positions)."""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _fold_windows(changed: list[int], context: int) -> list[list[int]]:
+    """Merge the ``[idx - context, idx + context]`` windows around changed
+    line indices (ascending) into disjoint ``[start, stop)`` intervals.
+
+    Windows that touch or overlap become one interval; *stop* may run
+    past the end of the diff, callers slice with it.
+    """
+    windows: list[list[int]] = []
+    for idx in changed:
+        lo = idx - context
+        if windows and lo <= windows[-1][1]:
+            windows[-1][1] = idx + context + 1
+        else:
+            windows.append([max(lo, 0), idx + context + 1])
+    return windows
+
+
+# Line boundaries str.splitlines() honours besides "\n"
+_OTHER_LINE_BREAKS = re.compile("[\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+def _split_lines(text: str | list[str]) -> list[str]:
+    """Split *text* like ``str.splitlines()``; lists are passed through untouched.
+
+    ``str.split("\\n")`` is much cheaper than ``splitlines()`` on large
+    texts, so it is used when ``\\n`` is the only line boundary present;
+    a trailing newline then does not produce an empty last line.  Any
+    other boundary ``splitlines()`` knows (``\\r``, ``\\f``, ``\\u2029``, ...)
+    sends the text through ``splitlines()`` itself, which keeps line
+    numbers in step with ``diff_files`` and with QTextDocument blocks.
+    """
+    if not isinstance(text, str):
+        return text
+    if _OTHER_LINE_BREAKS.search(text):
+        return text.splitlines()
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return lines
+
+
+def _highlight_ranges(text: str, spans: list[CharSpan]) -> list[tuple[int, int]]:
+    """Highlighted ``(start, end)`` ranges of *text*, in Qt positions.
+
+    Adjacent highlighted spans are fused, so each run costs one format
+    merge however many spans it was reported as.
+    """
+    ranges: list[tuple[int, int]] = []
+    limit = len(text)
+    for span in spans:
+        if span.tag not in _HIGHLIGHT_TAGS:
+            continue
+        start, end = span.start, min(span.end, limit)
+        if start >= end:
+            continue
+        if ranges and ranges[-1][1] == start:
+            ranges[-1] = (ranges[-1][0], end)
+        else:
+            ranges.append((start, end))
+    if ranges and not text.isascii() and _utf16_len(text) != limit:
+        # Characters outside the BMP take two positions in Qt
+        ranges = [(_utf16_len(text[:s]), _utf16_len(text[:e])) for s, e in ranges]
+    return ranges
+
+
+@dataclass(slots=True)
+class _PaneFormats:
+    """Formats one diff pane is painted with under one palette."""
+    equal_block: QTextBlockFormat
+    block: dict[LineTag, QTextBlockFormat]   # lines not on the equal background
+    text: QTextCharFormat
+    hunk: QTextCharFormat
+    highlight: QTextCharFormat
+
+
+# (palette colours, side) → formats; palettes never change, so id() is stable
+_PANE_FORMATS: dict[tuple[int, int], _PaneFormats] = {}
+
+
+def _block_format(bg: QColor) -> QTextBlockFormat:
+    fmt = QTextBlockFormat()
+    fmt.setBackground(bg)
+    return fmt
+
+
+def _pane_formats(side: int) -> _PaneFormats:
+    """Formats for the left (0) or right (1) pane, built once per palette."""
+    c = palette_qcolors()
+    fmts = _PANE_FORMATS.get((id(c), side))
+    if fmts is not None:
+        return fmts
+    if side == 0:
+        own_tag, changed_bg, char_bg = LineTag.DELETE, c["diff_del_bg"], c["diff_del_char_bg"]
+    else:
+        own_tag, changed_bg, char_bg = LineTag.INSERT, c["diff_add_bg"], c["diff_add_char_bg"]
+    changed = _block_format(changed_bg)
+    block = {
+        own_tag: changed,
+        LineTag.REPLACE: changed,
+        LineTag.HUNK: _block_format(c["diff_hunk_bg"]),
+    }
+    text = QTextCharFormat()
+    text.setForeground(c["fg"])
+    hunk = QTextCharFormat()
+    hunk.setForeground(c["fg_dim"])
+    highlight = QTextCharFormat()
+    highlight.setBackground(char_bg)
+    fmts = _PANE_FORMATS[(id(c), side)] = _PaneFormats(
+        _block_format(c["diff_equal_bg"]), block, text, hunk, highlight,
+    )
+    return fmts
 
 # ═══════════════════════════════════════════════════════════════════════════
 # Line-number gutter
@@ -44,18 +171,6 @@ class _LineNumberArea(QWidget):
         self._editor.line_number_area_paint(event)
 
 
-# ═══════════════════════════════════════════════════════════════════════════
-# Block user data (stores line-level metadata per text block)
-# ═══════════════════════════════════════════════════════════════════════════
-
-class _BlockData(QTextBlockUserData):
-    def __init__(self):
-        super().__init__()
-        self.tag: LineTag = LineTag.EQUAL
-        self.lineno: int | None = None
-        self.char_spans: list[CharSpan] = []
-
-
 # ═══════════════════════════════════════════════════════════════════════════
 # Diff text editor (one side)
 # ═══════════════════════════════════════════════════════════════════════════
@@ -65,7 +180,19 @@ class _DiffTextEdit(QPlainTextEdit):
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        # Gutter width is recomputed only when the digit count or font changes
+        self._digit_width = 0
+        self._gutter_digits = -1
+        self._gutter_width = 0
+        self._margin = -1
+        self._gutter_font = QFont("Consolas", 10)
+        self._line_height = 0
         self.setReadOnly(True)
+        # Mouse selection only: without keyboard interaction Qt shows no
+        # text cursor, so no blink timer runs while a pane has focus
+        self.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        # Read-only: formatting passes need not be recorded for undo
+        self.document().setUndoRedoEnabled(False)
         self.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
         self.setFont(QFont("Consolas", 10))
 
@@ -74,14 +201,90 @@ class _DiffTextEdit(QPlainTextEdit):
         self.updateRequest.connect(self._update_line_area)
         self._update_line_area_width(0)
 
+        # Per-line metadata, indexed by block number
+        self._linenos: list[int | None] = []
+        # Character highlights not yet merged in: block number → (text, spans)
+        self._pending_spans: dict[int, tuple[str, list[CharSpan]]] = {}
+        self._highlight_fmt = QTextCharFormat()
+        self.verticalScrollBar().valueChanged.connect(self._highlight_visible)
+
+    def clear(self):
+        self._linenos = []
+        self._pending_spans = {}
+        super().clear()
+
+    def setPlainText(self, text: str):
+        # Queued spans belong to the old document; drop them before the
+        # scrollbar reset can merge them in at stale offsets
+        self._pending_spans = {}
+        super().setPlainText(text)
+
+    def set_line_numbers(self, linenos: list[int | None]):
+        """Set the gutter's line number for each block (None = blank)."""
+        self._linenos = linenos
+
+    # ── character highlights (applied as blocks come into view) ───────────
+
+    def set_char_highlights(
+        self, pending: dict[int, tuple[str, list[CharSpan]]], fmt: QTextCharFormat,
+    ):
+        """Queue character-span highlights for the current document.
+
+        Each block's spans are merged into the document only once the
+        block scrolls into view, so a long diff pays for what is looked at.
+        """
+        self._pending_spans = pending
+        self._highlight_fmt = fmt
+        self._highlight_visible()
+
+    def _highlight_visible(self, *_):
+        pending = self._pending_spans
+        if not pending:
+            return
+        block = self.firstVisibleBlock()
+        offset = self.contentOffset()
+        bottom = self.viewport().rect().bottom()
+        keep = QTextCursor.MoveMode.KeepAnchor
+        cursor = None
+        while block.isValid() and self.blockBoundingGeometry(block).translated(offset).top() <= bottom:
+            item = pending.pop(block.blockNumber(), None)
+            if item is not None:
+                if cursor is None:
+                    cursor = QTextCursor(self.document())
+                    cursor.beginEditBlock()
+                pos = block.position()
+                for start, end in _highlight_ranges(*item):
+                    cursor.setPosition(pos + start)
+                    cursor.setPosition(pos + end, keep)
+                    cursor.mergeCharFormat(self._highlight_fmt)
+            block = block.next()
+        if cursor is not None:
+            cursor.endEditBlock()
+
     # ── line number gutter ────────────────────────────────────────────────
 
     def line_number_area_width(self) -> int:
-        digits = max(1, len(str(self.blockCount())))
-        return 12 + self.fontMetrics().horizontalAdvance("9") * max(digits, 4)
+        digits = max(len(str(self.blockCount())), 4)
+        if digits != self._gutter_digits:
+            if not self._digit_width:
+                self._digit_width = self.fontMetrics().horizontalAdvance("9")
+            self._gutter_digits = digits
+            self._gutter_width = 12 + self._digit_width * digits
+        return self._gutter_width
 
     def _update_line_area_width(self, _):
-        self.setViewportMargins(self.line_number_area_width(), 0, 0, 0)
+        width = self.line_number_area_width()
+        if width != self._margin:
+            self._margin = width
+            self.setViewportMargins(width, 0, 0, 0)
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.FontChange:
+            self._digit_width = 0
+            self._line_height = 0
+            self._gutter_digits = -1
+            self._update_line_area_width(0)
+        super().changeEvent(event)
 
     def _update_line_area(self, rect, dy):
         if dy:
@@ -97,33 +300,35 @@ class _DiffTextEdit(QPlainTextEdit):
         self._line_area.setGeometry(
             QRect(cr.left(), cr.top(), self.line_number_area_width(), cr.height())
         )
+        self._highlight_visible()
 
     def line_number_area_paint(self, event):
-        p = palette()
+        c = palette_qcolors()
         painter = QPainter(self._line_area)
-        painter.fillRect(event.rect(), QColor(p["bg_alt"]))
+        painter.fillRect(event.rect(), c["bg_alt"])
 
         block = self.firstVisibleBlock()
+        number = block.blockNumber()
+        linenos = self._linenos
         top = round(self.blockBoundingGeometry(block).translated(self.contentOffset()).top())
         bottom = top + round(self.blockBoundingRect(block).height())
-        fg = QColor(p["fg_dim"])
-        painter.setPen(fg)
-        font = QFont("Consolas", 10)
-        painter.setFont(font)
+        painter.setPen(c["fg_dim"])
+        painter.setFont(self._gutter_font)
+        if not self._line_height:
+            self._line_height = self.fontMetrics().height()
+        line_height = self._line_height
+        text_width = self._line_area.width() - 4
 
         while block.isValid() and top <= event.rect().bottom():
             if block.isVisible() and bottom >= event.rect().top():
-                data = block.userData()
-                if isinstance(data, _BlockData) and data.lineno is not None:
-                    num_text = str(data.lineno)
-                else:
-                    num_text = ""
+                lineno = linenos[number] if number < len(linenos) else None
+                num_text = "" if lineno is None else str(lineno)
                 painter.drawText(
-                    0, top, self._line_area.width() - 4,
-                    self.fontMetrics().height(),
+                    0, top, text_width, line_height,
                     Qt.AlignmentFlag.AlignRight, num_text,
                 )
             block = block.next()
+            number += 1
             top = bottom
             bottom = top + round(self.blockBoundingRect(block).height())
 
@@ -143,7 +348,9 @@ class TwoWayDiffView(QWidget):
         super().__init__(parent)
         self._raw_diff_data: list[DiffLine] = []   # full file diff (no context folding)
         self._diff_data: list[DiffLine] = []        # currently displayed (may be folded)
+        self._folded: list[DiffLine] | None = None   # folded view of the raw diff, once built
         self._change_groups: list[int] = []          # block index of *first* line in each group
+        self._group_positions: tuple[list[int], list[int]] = ([], [])   # per side, per group
         self._current_group: int = -1
         self._show_full = False
 
@@ -228,6 +435,13 @@ class TwoWayDiffView(QWidget):
 
         # ── Synchronise scrolling ─────────────────────────────────────────
         self._syncing = False
+        # Wheel scrolling fires far more often than frames are drawn; only
+        # the latest position is passed on, once per event-loop pass
+        self._pending_sync: tuple[_DiffTextEdit, int] | None = None
+        self._sync_timer = QTimer(self)
+        self._sync_timer.setSingleShot(True)
+        self._sync_timer.setInterval(0)
+        self._sync_timer.timeout.connect(self._flush_sync)
         self._left_edit.verticalScrollBar().valueChanged.connect(self._sync_scroll_left)
         self._right_edit.verticalScrollBar().valueChanged.connect(self._sync_scroll_right)
 
@@ -245,6 +459,7 @@ class TwoWayDiffView(QWidget):
     ):
         """Populate both panes from pre-computed diff data (full, no context folding)."""
         self._raw_diff_data = diff_data
+        self._folded = None
         self._cur_left_title = left_title
         self._cur_right_title = right_title
         self._left_label.setText(left_title)
@@ -267,13 +482,23 @@ class TwoWayDiffView(QWidget):
 
     def show_texts(
         self,
-        left_text: str, right_text: str,
+        left_text: str | list[str], right_text: str | list[str],
+        left_title: str = "Left", right_title: str = "Right",
+        context: int | None = None,
+    ):
+        """Diff two strings (or already split line lists) and display."""
+        self.show_lines(
+            _split_lines(left_text), _split_lines(right_text),
+            left_title, right_title, context,
+        )
+
+    def show_lines(
+        self,
+        left_lines: list[str], right_lines: list[str],
         left_title: str = "Left", right_title: str = "Right",
         context: int | None = None,
     ):
-        """Diff two strings and display."""
-        left_lines = left_text.splitlines()
-        right_lines = right_text.splitlines()
+        """Diff two line lists and display, without joining or re-splitting."""
         data = diff_lines(left_lines, right_lines, context=None)
         self.show_diff(data, left_title, right_title)
 
@@ -282,7 +507,9 @@ class TwoWayDiffView(QWidget):
         self._right_edit.clear()
         self._raw_diff_data = []
         self._diff_data = []
+        self._folded = None
         self._change_groups = []
+        self._group_positions = ([], [])
         self._current_group = -1
         self._change_label.setText("")
 
@@ -303,7 +530,10 @@ class TwoWayDiffView(QWidget):
         if self._show_full:
             self._diff_data = self._raw_diff_data
         else:
-            self._diff_data = self._fold_context(self._raw_diff_data, self.DEFAULT_CONTEXT)
+            # Toggling back or re-rendering for a theme reuses the fold
+            if self._folded is None:
+                self._folded = self._fold_context(self._raw_diff_data, self.DEFAULT_CONTEXT)
+            self._diff_data = self._folded
         self._render()
 
     # ── Rendering ─────────────────────────────────────────────────────────
@@ -313,7 +543,8 @@ class TwoWayDiffView(QWidget):
         """Collapse equal runs into hunk separators, keeping *context* lines."""
         if not raw:
             return raw
-        interesting = [i for i, d in enumerate(raw) if d.tag != LineTag.EQUAL]
+        equal = LineTag.EQUAL
+        interesting = [i for i, d in enumerate(raw) if d.tag is not equal]
         if not interesting:
             # All equal — show summary
             if len(raw) > context * 2:
@@ -326,21 +557,18 @@ class TwoWayDiffView(QWidget):
                 return result
             return list(raw)
 
+        # Integer-only interval merge, then one slice copy per window
+        windows = _fold_windows(interesting, context)
         result: list[DiffLine] = []
-        last = -1
-        for idx in interesting:
-            start = max(last + 1, idx - context)
-            if result and start > last + 1:
+        for lo, hi in windows:
+            if result:
                 result.append(DiffLine(
                     tag=LineTag.HUNK, left_lineno=None, right_lineno=None,
                     left_text="", right_text="",
                 ))
-            for i in range(start, min(idx + context + 1, len(raw))):
-                if i > last:
-                    result.append(raw[i])
-            last = max(last, idx + context)
+            result.extend(raw[lo:hi])
 
-        remaining = last + 1
+        remaining = windows[-1][1]
         if remaining < len(raw):
             tail = raw[remaining: remaining + context]
             if tail:
@@ -353,138 +581,101 @@ class TwoWayDiffView(QWidget):
         return result
 
     def _render(self):
-        p = palette()
-        self._left_edit.clear()
-        self._right_edit.clear()
-
-        bg_add   = QColor(p["diff_add_bg"])
-        bg_del   = QColor(p["diff_del_bg"])
-        bg_eq    = QColor(p["diff_equal_bg"])
-        bg_hunk  = QColor(p["diff_hunk_bg"])
-        char_add = QColor(p["diff_add_char_bg"])
-        char_del = QColor(p["diff_del_char_bg"])
-        fg       = QColor(p["fg"])
-        fg_dim   = QColor(p["fg_dim"])
-
-        left_cursor = QTextCursor(self._left_edit.document())
-        right_cursor = QTextCursor(self._right_edit.document())
-
-        self._change_indices = []
-
-        for i, dl in enumerate(self._diff_data):
-            if i > 0:
-                left_cursor.insertBlock()
-                right_cursor.insertBlock()
-
-            # Track changes for navigation
-            if dl.tag not in (LineTag.EQUAL, LineTag.HUNK):
-                self._change_indices.append(i)
-
-            # Determine background colours
-            if dl.tag == LineTag.EQUAL:
-                left_bg, right_bg = bg_eq, bg_eq
-            elif dl.tag == LineTag.INSERT:
-                left_bg, right_bg = bg_eq, bg_add
-            elif dl.tag == LineTag.DELETE:
-                left_bg, right_bg = bg_del, bg_eq
-            elif dl.tag == LineTag.REPLACE:
-                left_bg, right_bg = bg_del, bg_add
-            elif dl.tag == LineTag.HUNK:
-                left_bg, right_bg = bg_hunk, bg_hunk
-            else:
-                left_bg, right_bg = bg_eq, bg_eq
-
-            # Set block background via block format
-            lbf = left_cursor.blockFormat()
-            lbf.setBackground(left_bg)
-            left_cursor.setBlockFormat(lbf)
-
-            rbf = right_cursor.blockFormat()
-            rbf.setBackground(right_bg)
-            right_cursor.setBlockFormat(rbf)
-
-            # Store metadata
-            left_data = _BlockData()
-            left_data.tag = dl.tag
-            left_data.lineno = dl.left_lineno
-            left_data.char_spans = dl.left_char_spans
-
-            right_data = _BlockData()
-            right_data.tag = dl.tag
-            right_data.lineno = dl.right_lineno
-            right_data.char_spans = dl.right_char_spans
-
-            # Insert text with character-level highlighting
-            if dl.tag == LineTag.HUNK:
-                fmt = QTextCharFormat()
-                fmt.setForeground(fg_dim)
-                left_cursor.insertText("─── ⋯ ───", fmt)
-                right_cursor.insertText("─── ⋯ ───", fmt)
-            else:
-                self._insert_with_char_highlights(
-                    left_cursor, dl.left_text, dl.left_char_spans,
-                    fg, left_bg, char_del,
-                )
-                self._insert_with_char_highlights(
-                    right_cursor, dl.right_text, dl.right_char_spans,
-                    fg, right_bg, char_add,
-                )
-
-            # Assign block user data
-            left_cursor.block().setUserData(left_data)
-            right_cursor.block().setUserData(right_data)
-
-        self._current_change = -1
-        # Build change groups: a contiguous run of changed lines = one group
-        self._change_groups = []
-        in_group = False
-        for idx in self._change_indices:
-            if not in_group or (self._change_groups and idx > self._change_indices[self._change_indices.index(idx) - 1] + 1):
-                self._change_groups.append(idx)
-                in_group = True
-        # Deduplicate: only first block index of each contiguous run
+        # Change groups: a contiguous run of changed lines = one group,
+        # recorded by the block index of its first line
+        unchanged = (LineTag.EQUAL, LineTag.HUNK)
+        changes: list[int] = []
         groups: list[int] = []
         prev = -2
-        for idx in self._change_indices:
-            if idx != prev + 1:
-                groups.append(idx)
-            prev = idx
+        for i, dl in enumerate(self._diff_data):
+            if dl.tag not in unchanged:
+                if i != prev + 1:
+                    groups.append(i)
+                changes.append(i)
+                prev = i
+        self._change_indices = changes
         self._change_groups = groups
         self._current_group = -1
 
+        # Both panes change completely; repaint once when both are done
+        self.setUpdatesEnabled(False)
+        try:
+            self._group_positions = (
+                self._fill_pane(self._left_edit, 0),
+                self._fill_pane(self._right_edit, 1),
+            )
+        finally:
+            self.setUpdatesEnabled(True)
+
         n = len(self._change_groups)
         self._change_label.setText(f" {n} change{'s' if n != 1 else ''}")
 
-    def _insert_with_char_highlights(
-        self,
-        cursor: QTextCursor,
-        text: str,
-        spans: list[CharSpan],
-        fg_color: QColor,
-        line_bg: QColor,
-        highlight_bg: QColor,
-    ):
-        if not spans:
-            fmt = QTextCharFormat()
-            fmt.setForeground(fg_color)
-            cursor.insertText(text, fmt)
-            return
-
-        for span in spans:
-            fmt = QTextCharFormat()
-            fmt.setForeground(fg_color)
-            if span.tag in ("delete", "insert", "replace"):
-                fmt.setBackground(highlight_bg)
-            chunk = text[span.start:span.end]
-            if chunk:
-                cursor.insertText(chunk, fmt)
-
-        # Any remaining text past spans
-        max_end = max((s.end for s in spans), default=0)
-        if max_end < len(text):
-            fmt = QTextCharFormat()
-            fmt.setForeground(fg_color)
-            cursor.insertText(text[max_end:], fmt)
+    def _fill_pane(self, edit: _DiffTextEdit, side: int) -> list[int]:
+        """Load one pane (*side* 0 = left, 1 = right) from ``_diff_data``.
+
+        The text goes in with a single ``setPlainText``; formats are then
+        laid over position ranges inside one edit block, so the document
+        is laid out once rather than after every inserted line.  Returns
+        the document position of each change group's first line.
+        """
+        data = self._diff_data
+        left = side == 0
+        hunk = LineTag.HUNK
+        texts = [
+            _HUNK_TEXT if dl.tag is hunk else (dl.left_text if left else dl.right_text)
+            for dl in data
+        ]
+        edit.set_line_numbers(
+            [dl.left_lineno for dl in data] if left else [dl.right_lineno for dl in data]
+        )
+        edit.setPlainText("\n".join(texts))
+        if not data:
+            edit.set_char_highlights({}, QTextCharFormat())
+            return []
+
+        fmts = _pane_formats(side)
+        block_fmts = fmts.block
+        hunk_fmt = fmts.hunk
+        doc = edit.document()
+        cursor = QTextCursor(doc)
+        keep = QTextCursor.MoveMode.KeepAnchor
+        cursor.beginEditBlock()
+
+        # Equal-line background and text colour for everything in one go;
+        # the per-line pass below only touches lines that differ from that
+        cursor.select(QTextCursor.SelectionType.Document)
+        cursor.setBlockFormat(fmts.equal_block)
+        cursor.setCharFormat(fmts.text)
+
+        # Only lines off the equal background need visiting at all
+        equal = LineTag.EQUAL
+        marked = [i for i, dl in enumerate(data) if dl.tag is not equal]
+        group_starts = set(self._change_groups)
+        positions: list[int] = []
+        pending: dict[int, tuple[str, list[CharSpan]]] = {}
+        find_block = doc.findBlockByNumber
+        for i in marked:
+            dl = data[i]
+            block = find_block(i)
+            pos = block.position()
+            if i in group_starts:
+                positions.append(pos)
+            bf = block_fmts.get(dl.tag)
+            if bf is not None:
+                cursor.setPosition(pos)
+                cursor.setBlockFormat(bf)
+
+            spans = dl.left_char_spans if left else dl.right_char_spans
+            if dl.tag is hunk:
+                cursor.setPosition(pos)
+                cursor.setPosition(pos + block.length() - 1, keep)
+                cursor.mergeCharFormat(hunk_fmt)
+            elif spans:
+                pending[i] = (texts[i], spans)
+
+        cursor.endEditBlock()
+        edit.set_char_highlights(pending, fmts.highlight)
+        return positions
 
     # ── Navigation ────────────────────────────────────────────────────────
 
@@ -509,30 +700,30 @@ class TwoWayDiffView(QWidget):
     def _scroll_to_group(self):
         if self._current_group < 0 or self._current_group >= len(self._change_groups):
             return
-        block_idx = self._change_groups[self._current_group]
-        block = self._left_edit.document().findBlockByNumber(block_idx)
-        if block.isValid():
-            cursor = QTextCursor(block)
-            self._left_edit.setTextCursor(cursor)
-            self._left_edit.centerCursor()
-        block = self._right_edit.document().findBlockByNumber(block_idx)
-        if block.isValid():
-            cursor = QTextCursor(block)
-            self._right_edit.setTextCursor(cursor)
-            self._right_edit.centerCursor()
+        # Positions were recorded while rendering; no block lookup needed
+        for edit, positions in zip((self._left_edit, self._right_edit), self._group_positions):
+            cursor = QTextCursor(edit.document())
+            cursor.setPosition(positions[self._current_group])
+            edit.setTextCursor(cursor)
+            edit.centerCursor()
 
     # ── Scroll sync ───────────────────────────────────────────────────────
 
     def _sync_scroll_left(self, value):
-        if self._syncing:
-            return
-        self._syncing = True
-        self._right_edit.verticalScrollBar().setValue(value)
-        self._syncing = False
+        if not self._syncing:
+            self._pending_sync = (self._right_edit, value)
+            self._sync_timer.start()
 
     def _sync_scroll_right(self, value):
-        if self._syncing:
+        if not self._syncing:
+            self._pending_sync = (self._left_edit, value)
+            self._sync_timer.start()
+
+    def _flush_sync(self):
+        if self._pending_sync is None:
             return
+        target, value = self._pending_sync
+        self._pending_sync = None
         self._syncing = True
-        self._left_edit.verticalScrollBar().setValue(value)
+        target.verticalScrollBar().setValue(value)
         self._syncing = False
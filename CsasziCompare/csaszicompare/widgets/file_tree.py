@@ -17,7 +17,7 @@ from PyQt6.QtWidgets import (
     QHeaderView, QLineEdit, QPushButton,
 )
 from PyQt6.QtGui import QFont, QFileSystemModel
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QEvent, pyqtSignal
 
 
 class _BreadcrumbBar(QWidget):
@@ -30,39 +30,59 @@ class _BreadcrumbBar(QWidget):
         self._layout = QHBoxLayout(self)
         self._layout.setContentsMargins(0, 0, 0, 0)
         self._layout.setSpacing(0)
-        self._labels: list[QLabel] = []
+        self._layout.addStretch()
+        self._font = QFont("Consolas", 10)
+        # Labels are kept and reused across paths; only as many as the
+        # deepest path so far are ever created.  Separator i sits before
+        # segment i + 1.
+        self._segments: list[QLabel] = []
+        self._separators: list[QLabel] = []
 
     def set_path(self, path: str):
-        # Clear existing
-        for lbl in self._labels:
-            self._layout.removeWidget(lbl)
-            lbl.deleteLater()
-        self._labels.clear()
-
         parts = Path(path).parts  # e.g. ('C:\\', 'Users', 'foo')
-        for i, part in enumerate(parts):
-            seg_path = str(Path(*parts[:i + 1]))
-            # Separator
-            if i > 0:
-                sep = QLabel(" › ")
-                sep.setFont(QFont("Consolas", 10))
-                sep.setStyleSheet("color: grey; padding: 0;")
-                sep.setFixedWidth(sep.fontMetrics().horizontalAdvance(" › "))
-                self._layout.addWidget(sep)
-                self._labels.append(sep)
-            # Segment
-            lbl = QLabel(part.rstrip(os.sep + "/"))
-            lbl.setFont(QFont("Consolas", 10))
-            lbl.setCursor(Qt.CursorShape.PointingHandCursor)
-            lbl.setStyleSheet(
-                "QLabel { padding: 1px 2px; border-radius: 2px; }"
-                "QLabel:hover { background: rgba(255,255,255,0.1); }"
-            )
-            lbl.mousePressEvent = lambda e, p=seg_path: self.segment_clicked.emit(p)
-            self._layout.addWidget(lbl)
-            self._labels.append(lbl)
+        self.setUpdatesEnabled(False)
+        try:
+            while len(self._segments) < len(parts):
+                self._add_segment()
+            for i, lbl in enumerate(self._segments):
+                used = i < len(parts)
+                if used:
+                    lbl.setText(parts[i].rstrip(os.sep + "/"))
+                    lbl.setProperty("seg_path", str(Path(*parts[:i + 1])))
+                lbl.setVisible(used)
+                if i > 0:
+                    self._separators[i - 1].setVisible(used)
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def _add_segment(self):
+        """Append a segment label (and its separator) before the stretch."""
+        if self._segments:
+            sep = QLabel(" › ")
+            sep.setFont(self._font)
+            sep.setStyleSheet("color: grey; padding: 0;")
+            sep.setFixedWidth(sep.fontMetrics().horizontalAdvance(" › "))
+            self._layout.insertWidget(self._layout.count() - 1, sep)
+            self._separators.append(sep)
+        lbl = QLabel()
+        lbl.setFont(self._font)
+        lbl.setCursor(Qt.CursorShape.PointingHandCursor)
+        lbl.setStyleSheet(
+            "QLabel { padding: 1px 2px; border-radius: 2px; }"
+            "QLabel:hover { background: rgba(255,255,255,0.1); }"
+        )
+        lbl.installEventFilter(self)
+        self._layout.insertWidget(self._layout.count() - 1, lbl)
+        self._segments.append(lbl)
 
-        self._layout.addStretch()
+    def eventFilter(self, obj, event):
+        # One handler for every segment; each label carries its own path
+        if event.type() == QEvent.Type.MouseButtonPress:
+            seg_path = obj.property("seg_path")
+            if seg_path:
+                self.segment_clicked.emit(seg_path)
+                return True
+        return super().eventFilter(obj, event)
 
 
 class FileTree(QWidget):
@@ -135,14 +155,9 @@ class FileTree(QWidget):
 
     def set_root(self, path: str):
         """Set the root directory shown in the tree."""
-        if not path or not os.path.isdir(path):
+        if not path:
             return
-        self._root = path
-        idx = self._model.setRootPath(path)
-        self._view.setRootIndex(idx)
-        self._header.setText(f"File Explorer — {os.path.basename(path)}")
-        self._path_edit.setText(path)
-        self._breadcrumb.set_path(path)
+        self._navigate_to(path)
 
     def _on_click(self, index):
         path = self._model.filePath(index)
@@ -171,11 +186,17 @@ class FileTree(QWidget):
 
     def _navigate_to(self, path: str):
         """Navigate the tree to *path*."""
-        if not os.path.isdir(path):
+        if path == self._root or not os.path.isdir(path):
             return
         self._root = path
-        idx = self._model.setRootPath(path)
-        self._view.setRootIndex(idx)
-        self._header.setText(f"File Explorer — {os.path.basename(path)}")
-        self._path_edit.setText(path)
-        self._breadcrumb.set_path(path)
+        # Re-rooting relayouts the view and rebuilds the breadcrumb; hold
+        # repaints until everything is in place so it happens only once
+        self.setUpdatesEnabled(False)
+        try:
+            idx = self._model.setRootPath(path)
+            self._view.setRootIndex(idx)
+            self._header.setText(f"File Explorer — {os.path.basename(path)}")
+            self._path_edit.setText(path)
+            self._breadcrumb.set_path(path)
+        finally:
+            self.setUpdatesEnabled(True)